@@ -57,11 +57,12 @@ diagnosis.F90:194-203, ::
 7. fieldrms(0:mpsi,nfield), diagnosis.F90:83-136
 '''
 
+import functools
 import numpy
 from .. import tools
 from ..cores.converter import Converter, clog
 from ..cores.digger import Digger, dlog
-from .gtc import Ndigits_tstep
+from .gtc import Ndigits_tstep, trim_time_steps
 
 _all_Converters = ['Data1dConverter']
 _all_Diggers = ['Data1dFluxDigger', 'Data1dFieldDigger',
@@ -104,77 +105,64 @@ class Data1dConverter(Converter):
         '''Read 'data1d.out'.'''
         with self.rawloader.get(self.files) as f:
             clog.debug("Read file '%s'." % self.files)
-            outdata = f.readlines()
-
-        sd = {}
-        # 1. diagnosis.F90:opendiag():739
-        clog.debug("Filling datakeys: %s ..." % str(self._datakeys[:7]))
-        for i, key in enumerate(self._datakeys[:7]):
-            sd.update({key: int(outdata[i].strip())})
-
-        # 2. diagnosis.F90:opendiag():790
-        outdata = numpy.array([float(n.strip()) for n in outdata[7:]])
-        ndata = sd['mpsi+1'] * (sd['nspecies'] * sd['mpdata1d'] +
-                                sd['nfield'] * sd['mfdata1d'])
-        if len(outdata) // ndata != sd['ndstep']:
-            clog.debug("Filling datakeys: %s ..." % 'ndstep')
-            sd.update({'ndstep': len(outdata) // ndata})
-            outdata = outdata[:sd['ndstep'] * ndata]
-
-        # reshape outdata
-        outdata = outdata.reshape((ndata, sd['ndstep']), order='F')
-
+            sd = {}
+            # 1. diagnosis.F90:opendiag():739
+            clog.debug("Filling datakeys: %s ..." % str(self._datakeys[:7]))
+            for i, key in enumerate(self._datakeys[:7]):
+                sd.update({key: int(f.readline().strip())})
+
+            # 2. diagnosis.F90:opendiag():790
+            ndata = sd['mpsi+1'] * (sd['nspecies'] * sd['mpdata1d'] +
+                                    sd['nfield'] * sd['mfdata1d'])
+            outdata = tools.read_floats(f, sizehint=sd['ndstep'] * ndata)
+
+        outdata, ndstep = trim_time_steps(
+            outdata, ndata, sd['ndstep'], self.files)
+        sd.update({'ndstep': ndstep})
+
+        # reshape outdata, outdata[k] is the k-th (0:mpsi) block,
+        # one C-order copy, time is the contiguous axis for the diggers
+        outdata = outdata.reshape(
+            (sd['ndstep'], ndata // sd['mpsi+1'], sd['mpsi+1']))
+        outdata = numpy.ascontiguousarray(outdata.transpose(1, 2, 0))
+
+        # schedule: (datakeys, index of first block)
         # 3. data1di(0:mpsi,mpdata1d), mpdata1d=3
-        clog.debug("Filling datakeys: %s ..." % str(self._datakeys[7:10]))
-        sd.update({'i-particle-flux': outdata[:sd['mpsi+1'], :]})
-        index0, index1 = sd['mpsi+1'], 2 * sd['mpsi+1']
-        sd.update({'i-energy-flux':  outdata[index0:index1, :]})
-        index0, index1 = 2 * sd['mpsi+1'], 3 * sd['mpsi+1']
-        sd.update({'i-momentum-flux':  outdata[index0:index1, :]})
-
+        schedule = [(self._datakeys[7:10], 0)]
+        index0 = 3
         # 4. data1de(0:mpsi,mpdata1d)
         if sd['nspecies'] > 1 and sd['nhybrid'] > 0:
-            clog.debug("Filling datakeys: %s ..." % str(self._datakeys[10:13]))
-            index0, index1 = index1, index1 + sd['mpsi+1']
-            sd.update({'e-particle-flux': outdata[index0:index1, :]})
-            index0, index1 = index1, index1 + sd['mpsi+1']
-            sd.update({'e-energy-flux': outdata[index0:index1, :]})
-            index0, index1 = index1, index1 + sd['mpsi+1']
-            sd.update({'e-momentum-flux': outdata[index0:index1, :]})
-
+            schedule.append((self._datakeys[10:13], index0))
+            index0 += 3
         # 5. data1df(0:mpsi,mpdata1d)
         if ((sd['nspecies'] == 2 and sd['nhybrid'] == 0) or
                 (sd['nspecies'] == 3 and sd['nhybrid'] > 0)):
-            clog.debug("Filling datakeys: %s ..." % str(self._datakeys[13:16]))
-            index0, index1 = index1, index1 + sd['mpsi+1']
-            sd.update({'f-particle-flux': outdata[index0:index1, :]})
-            index0, index1 = index1, index1 + sd['mpsi+1']
-            sd.update({'f-energy-flux': outdata[index0:index1, :]})
-            index0, index1 = index1, index1 + sd['mpsi+1']
-            sd.update({'f-momentum-flux': outdata[index0:index1, :]})
-
+            schedule.append((self._datakeys[13:16], index0))
         # 6. field00(0:mpsi,nfield), nfield=3
-        clog.debug("Filling datakeys: %s ..." % str(self._datakeys[16:19]))
-        index0 = sd['mpsi+1'] * sd['nspecies'] * sd['mpdata1d']
-        index1 = index0 + sd['mpsi+1']
-        sd.update({'field00-phi': outdata[index0:index1, :]})
-        index0, index1 = index1, index1 + sd['mpsi+1']
-        sd.update({'field00-apara': outdata[index0:index1, :]})
-        index0, index1 = index1, index1 + sd['mpsi+1']
-        sd.update({'field00-fluidne': outdata[index0:index1, :]})
-
         # 7. fieldrms(0:mpsi,nfield)
-        clog.debug("Filling datakeys: %s ..." % str(self._datakeys[19:22]))
-        index0, index1 = index1, index1 + sd['mpsi+1']
-        sd.update({'fieldrms-phi': outdata[index0:index1, :]})
-        index0, index1 = index1, index1 + sd['mpsi+1']
-        sd.update({'fieldrms-apara': outdata[index0:index1, :]})
-        index0, index1 = index1, index1 + sd['mpsi+1']
-        sd.update({'fieldrms-fluidne': outdata[index0:index1, :]})
+        index0 = sd['nspecies'] * sd['mpdata1d']
+        schedule.append((self._datakeys[16:22], index0))
+        for keys, index0 in schedule:
+            clog.debug("Filling datakeys: %s ..." % str(keys))
+            for i, key in enumerate(keys):
+                sd[key] = outdata[index0 + i]
 
         return sd
 
 
+@functools.lru_cache(maxsize=8)
+def _time_mpsi_axes(x, y, dt):
+    '''
+    Return cached time axis ``around(arange(1, x+1)*dt, 8)`` and
+    mpsi axis ``arange(0, y)``. They are read-only, shared by calls.
+    '''
+    X = numpy.around(numpy.arange(1, x + 1) * dt, 8)
+    Y = numpy.arange(0, y)
+    X.flags.writeable = False
+    Y.flags.writeable = False
+    return X, Y
+
+
 class _Data1dDigger(Digger):
     '''
     :meth:`_dig` for Data1dFluxDigger, Data1dFieldDigger
@@ -199,8 +187,7 @@ class _Data1dDigger(Digger):
         tstep = round(tstep, Ndigits_tstep)
         y, x = data.shape
         dt = tstep * ndiag
-        X, Y = numpy.arange(1, x + 1) * dt, numpy.arange(0, y)
-        X = numpy.around(X, 8)
+        X, Y = _time_mpsi_axes(x, y, dt)
         if self.kwoptions is None:
             self.kwoptions = dict(
                 tcutoff=dict(widget='FloatRangeSlider',
@@ -219,9 +206,10 @@ class _Data1dDigger(Digger):
         x0, x1 = 0, X.size
         if 'tcutoff' in kwargs:
             t0, t1 = kwargs['tcutoff']
-            index = numpy.where((X >= t0) & (X < t1 + dt))[0]
-            if index.size > 0:
-                x0, x1 = index[0], index[-1]+1
+            # X, Y are sorted, X[i0:i1] in range [t0, t1+dt)
+            i0, i1 = numpy.searchsorted(X, [t0, t1 + dt], side='left')
+            if i0 < i1:
+                x0, x1 = i0, i1
                 acckwargs['tcutoff'] = [X[x0], X[x1-1]]
                 X = X[x0:x1]
             else:
@@ -229,9 +217,9 @@ class _Data1dDigger(Digger):
         y0, y1 = 0, Y.size
         if 'pcutoff' in kwargs:
             p0, p1 = kwargs['pcutoff']
-            index = numpy.where((Y >= p0) & (Y < p1+1))[0]
-            if index.size > 0:
-                y0, y1 = index[0], index[-1]+1
+            i0, i1 = numpy.searchsorted(Y, [p0, p1+1], side='left')
+            if i0 < i1:
+                y0, y1 = i0, i1
                 acckwargs['pcutoff'] = [Y[y0], Y[y1-1]]
                 Y = Y[y0:y1]
             else:
@@ -317,6 +305,78 @@ class Data1dFieldDigger(_Data1dDigger):
             return r'$%s rms$' % field_tex_str[self.section[2]]
 
 
+def _mean_near_peak(Y, Z, lowerlimit, greedy, z_abs, weight_order):
+    '''
+    Vectorized `tools.near_peak` (select='one', intersection=True)
+    for every column Z[:, t], then weighted average of the points near peak,
+    weight is 'gradient(Y near peak) * abs(z)^weight_order'.
+    Return 1D arrays meanZ, upY, downY, midY.
+    '''
+    n, nt = Z.shape
+    cols = numpy.arange(nt)
+    idx = numpy.arange(n)[:, numpy.newaxis]
+    peak = Z.argmax(axis=0)
+    limit = lowerlimit * Z[peak, cols]
+    above = Z >= limit
+    if greedy:
+        # first, last index >= limit, search from edge, default 0, n-1
+        left = numpy.argmax(above & (idx < peak), axis=0)
+        right = n - 1 - numpy.argmax((above & (idx > peak))[::-1], axis=0)
+    else:
+        # all Z[left:right+1] >= limit, unless Z[peak] < limit
+        below = ~above & (idx <= peak)
+        left = numpy.where(below.any(axis=0),
+                           n - numpy.argmax(below[::-1], axis=0), 0)
+        left = numpy.minimum(left, peak)
+        below = ~above & (idx >= peak)
+        right = numpy.where(below.any(axis=0),
+                            numpy.argmax(below, axis=0) - 1, n - 1)
+        right = numpy.maximum(right, peak)
+    # extended columns, index i+1 is Z[i], intersections at left, right+2
+    extY = numpy.zeros((n + 2, nt))
+    extY[1:n+1] = Y[:, numpy.newaxis]
+    extZ = numpy.zeros((n + 2, nt))
+    extZ[1:n+1] = Z
+    has_left = (left > 0) & (Z[left, cols] > limit)
+    has_right = (right < n - 1) & (Z[right, cols] > limit)
+    # like near_peak, numpy.insert casts left x to Y.dtype, append doesn't
+    for has, i1, ext, xtype in ((has_left, left, left, Y.dtype),
+                                (has_right, right + 1, right + 2, float)):
+        c, i1, ext = cols[has], i1[has], ext[has]
+        # tools.intersection_4points of line P1P2 and P3P4, y=limit
+        P1x, P1y, P2x, P2y = Y[i1-1], Z[i1-1, c], Y[i1], Z[i1, c]
+        P3x, P3y, P4x, P4y = P1x, limit[c], P2x, limit[c]
+        tmp = (P1x-P2x)*(P3y-P4y)-(P1y-P2y)*(P3x-P4x)
+        extY[ext, c] = (((P1x*P2y-P1y*P2x)*(P3x-P4x)
+                         - (P3x*P4y-P3y*P4x)*(P1x-P2x))/tmp).astype(xtype)
+        extZ[ext, c] = ((P1x*P2y-P1y*P2x)*(P3y-P4y)
+                        - (P3x*P4y-P3y*P4x)*(P1y-P2y))/tmp
+    # extY[a:b+1, t] is the new sub array near peak
+    a, b = left + 1 - has_left, right + 1 + has_right
+    if numpy.any(b - a < 1):
+        raise ValueError("Shape of array too small to calculate a numerical"
+                         " gradient, at least 2 points near peak required.")
+    # numpy.gradient of extY[a:b+1, t]
+    dY = numpy.zeros((n + 2, nt))
+    dY[1:-1] = (extY[2:] - extY[:-2]) / 2.0
+    dY[a, cols] = extY[a + 1, cols] - extY[a, cols]
+    dY[b, cols] = extY[b, cols] - extY[b - 1, cols]
+    ext_idx = numpy.arange(n + 2)[:, numpy.newaxis]
+    dY[(ext_idx < a) | (ext_idx > b)] = 0.0
+    if z_abs:
+        extZ = numpy.abs(extZ)
+        weight = dY * extZ**weight_order
+    else:
+        weight = dY * numpy.abs(extZ)**weight_order
+    scl = weight.sum(axis=0)
+    if numpy.any(scl == 0.0):
+        raise ZeroDivisionError(
+            "Weights sum to zero, can't be normalized")
+    meanZ = (extZ * weight).sum(axis=0) / scl
+    midY = (extY * weight).sum(axis=0) / scl
+    return meanZ, extY[b, cols], extY[a, cols], midY
+
+
 class _Data1dMeanDigger(_Data1dDigger):
     '''
     :meth:`_dig` for Data1dMeanFluxDigger, Data1dMeanFieldDigger
@@ -369,49 +429,29 @@ class _Data1dMeanDigger(_Data1dDigger):
                 selectZ = Z[i0:i1+1]
                 weight = numpy.abs(selectZ)**weight_order
             if i0 < i1:
-                dY = numpy.array([numpy.gradient(Y[i0:i1+1])]).T
-                # weight = numpy.repeat(dY, len(X), axis=1) * weight
-                weight = numpy.tile(dY, (1, len(X))) * weight
+                dY = numpy.gradient(Y[i0:i1+1])[:, numpy.newaxis]
+                weight = dY * weight
             meanZ = numpy.average(selectZ, axis=0, weights=weight)
+            if smooth:
+                meanZ = tools.savgolay_filter(meanZ, info='Z mean')
             upY = numpy.linspace(Y[i1], Y[i1], len(X))
             downY = numpy.linspace(Y[i0], Y[i0], len(X))
             midY, maxY = None, None
         else:
-            maxZ = Z.max(axis=0)
-            maxidx = Z.argmax(axis=0)
-            meanZ, upY, downY, midY = [], [], [], []
-            maxY = Y[maxidx]
-            for t in range(len(X)):
-                tZ = Z[:, t]
-                nY, ntZ = tools.near_peak(
-                    tZ, X=Y, intersection=True, lowerlimit=peak_limit,
-                    select='one', greedy=peak_greedy)
-                if z_abs:
-                    ntZ = numpy.abs(ntZ)
-                    weight = numpy.gradient(nY) * ntZ**weight_order
-                else:
-                    weight = numpy.gradient(nY) * numpy.abs(ntZ)**weight_order
-                upY.append(nY[-1])
-                downY.append(nY[0])
-                midY.append(numpy.average(nY, weights=weight))
-                meanZ.append(numpy.average(ntZ, weights=weight))
-            upY, downY = numpy.array(upY), numpy.array(downY)
-            midY, meanZ = numpy.array(midY), numpy.array(meanZ)
+            maxY = Y[Z.argmax(axis=0)]
+            meanZ, upY, downY, midY = _mean_near_peak(
+                Y, Z, peak_limit, peak_greedy, z_abs, weight_order)
             if smooth:
-                upY = tools.savgolay_filter(numpy.array(upY), info='up')
-                downY = tools.savgolay_filter(numpy.array(downY), info='down')
-                maxY = tools.savgolay_filter(Y[maxidx], info='max')
-                midY = tools.savgolay_filter(numpy.array(midY), info='mid')
+                # smooth all lines along time axis in one call
+                upY, downY, maxY, midY, meanZ = tools.savgolay_filter(
+                    numpy.vstack((upY, downY, maxY, midY, meanZ)),
+                    info='up, down, max, mid, Z mean')
                 # min(Y) <= up, down, max, mid <= max(Y)
                 ymin, ymax = Y.min(), Y.max()
-                upY[upY > ymax] = ymax
-                downY[downY < ymin] = ymin
-                maxY[maxY > ymax] = ymax
-                maxY[maxY < ymin] = ymin
-                midY[midY > ymax] = ymax
-                midY[midY < ymin] = ymin
-        if smooth:
-            meanZ = tools.savgolay_filter(meanZ, info='Z mean')
+                numpy.minimum(upY, ymax, out=upY)
+                numpy.maximum(downY, ymin, out=downY)
+                numpy.clip(maxY, ymin, ymax, out=maxY)
+                numpy.clip(midY, ymin, ymax, out=midY)
         if 'mean_select' not in self.kwoptions:
             self.kwoptions.update(dict(
                 mean_select=dict(
@@ -553,9 +593,11 @@ class _Data1dFFTDigger(_Data1dDigger):
                 and fft_tselect[0] >= tcutoff[0]
                 and fft_tselect[1] <= tcutoff[1]):
             s0, s1 = fft_tselect
-            index = numpy.where((X >= s0) & (X <= s1))[0]
-            if index.size > 0:
-                it0, it1 = index[0], index[-1]+1
+            # X, pY are sorted, X[i0:i1] in range [s0, s1]
+            i0 = numpy.searchsorted(X, s0, side='left')
+            i1 = numpy.searchsorted(X, s1, side='right')
+            if i0 < i1:
+                it0, it1 = i0, i1
                 acckwargs['fft_tselect'] = [X[it0], X[it1-1]]
             else:
                 dlog.warning("Can't select: %s <= fft time <= %s!" % (s0, s1))
@@ -575,9 +617,10 @@ class _Data1dFFTDigger(_Data1dDigger):
                     pY = pY[1:-1]
                 else:
                     dlog.error("Wrong pY size: %d != %d" % (pY.size, Y.size))
-            index = numpy.where((pY >= s0) & (pY <= s1))[0]
-            if index.size > 0:
-                ip0, ip1 = index[0], index[-1]+1
+            i0 = numpy.searchsorted(pY, s0, side='left')
+            i1 = numpy.searchsorted(pY, s1, side='right')
+            if i0 < i1:
+                ip0, ip1 = i0, i1
                 acckwargs['fft_pselect'] = [pY[ip0], pY[ip1-1]]
             else:
                 dlog.warning("Can't select: %s <= fft ipsi <= %s!" % (s0, s1))
@@ -590,6 +633,8 @@ class _Data1dFFTDigger(_Data1dDigger):
             select_X = X[[it0, it1-1, it1-1, it0, it0]]
             select_Y = Y[[ip0, ip0, ip1-1, ip1-1, ip0]]
         dy = numpy.diff(Y).mean() if use_ra else 1.0
+        # C-contiguous for fft2, no copy if it is already
+        select_Z = numpy.ascontiguousarray(select_Z)
         tf, yf, af, pf = tools.fft2(dt, dy, select_Z)
         # fft_ymaxlimit
         pf_tmax = pf.max(axis=0)
@@ -600,8 +645,8 @@ class _Data1dFFTDigger(_Data1dDigger):
             maxlimit = pf_max * fft_ymaxlimit
             pf_tpass = pf_tmax >= maxlimit
             pf_ypass = pf_ymax >= maxlimit
-            pf_tlist = [i for i, j in enumerate(pf_tpass) if j]
-            pf_ylist = [i for i, j in enumerate(pf_ypass) if j]
+            pf_tlist = numpy.flatnonzero(pf_tpass).tolist()
+            pf_ylist = numpy.flatnonzero(pf_ypass).tolist()
         else:
             acckwargs['fft_ymaxlimit'] = 0.0
             pf_tlist, pf_ylist = 'all', 'all'
@@ -35,6 +35,7 @@ datax(mpsi/mskip+1,lst),dataz(mpsi/mskip+1,lst),data2d(mpsi/mskip+1,lst,5)
 '''
 
 import numpy
+from .. import tools
 from ..cores.converter import Converter, clog
 from ..cores.digger import Digger, dlog
 
@@ -85,29 +86,29 @@ class EquilibriumConverter(Converter):
         '''Read 'equilibrium.out'.'''
         with self.rawloader.get(self.files) as f:
             clog.debug("Read file '%s'." % self.files)
-            outdata = f.readlines()
+            header = [f.readline() for i in range(2)]
+            # numbers after header, including the 3 ints of second part
+            outdata = tools.read_floats(f)
 
         sd = {}
         # 1. first part
         clog.debug("Filling datakeys: %s ..." % str(self._datakeys[:3]))
-        sd.update({'nplot-1d': int(outdata[0].strip()),
-                   'nrad': int(outdata[1].strip())})
+        sd.update({'nplot-1d': int(header[0].strip()),
+                   'nrad': int(header[1].strip())})
         size1 = (sd['nplot-1d'] + 1) * sd['nrad']
         shape1 = ((sd['nplot-1d'] + 1), sd['nrad'])
-        data1 = numpy.array([float(n.strip()) for n in outdata[2:2 + size1]])
-        data1 = data1.reshape(shape1, order='C')
+        data1 = outdata[:size1].reshape(shape1, order='C')
         sd.update({'1d-data': data1})
         # 2. second part
         clog.debug("Filling datakeys: %s ..." % str(self._datakeys[3:6]))
-        index2 = 2 + size1
-        sd.update({'nplot-2d': int(outdata[index2].strip()),
-                   'mpsi-over-mskip+1': int(outdata[index2 + 1].strip()),
-                   'lst': int(outdata[index2 + 2].strip())})
+        index2 = size1
+        sd.update({'nplot-2d': int(outdata[index2]),
+                   'mpsi-over-mskip+1': int(outdata[index2 + 1]),
+                   'lst': int(outdata[index2 + 2])})
         clog.debug("Filling datakeys: %s ..." % str(self._datakeys[6:]))
         size2 = (sd['nplot-2d'] + 2) * sd['mpsi-over-mskip+1'] * sd['lst']
         shape2 = ((sd['nplot-2d'] + 2), sd['mpsi-over-mskip+1'] * sd['lst'])
-        data2 = numpy.array([float(n.strip())
-                             for n in outdata[index2 + 3:index2 + 3 + size2]])
+        data2 = outdata[index2 + 3:index2 + 3 + size2]
         data2 = data2.reshape(shape2, order='C')
         shape3 = (sd['mpsi-over-mskip+1'], sd['lst'])
         for i, key in enumerate(self._datakeys[6:]):
@@ -19,6 +19,23 @@ __all__ = _all_Converters + _all_Diggers
 Ndigits_tstep = 8
 
 
+def trim_time_steps(outdata, ndata, ndstep, files):
+    '''
+    Trim 1d array *outdata* to complete time steps of *ndata* numbers.
+    Header *ndstep* is the planned steps, GTC may still be running,
+    so warn when steps are missing or numbers are left.
+    Return trimmed outdata and the real ndstep.
+    '''
+    nstep, nrest = divmod(len(outdata), ndata)
+    if nstep == 0:
+        raise ValueError("No complete time step in '%s'!" % files)
+    if nstep != ndstep or nrest:
+        clog.warning("Got %d of planned %d time steps in '%s', "
+                     "%d numbers left!" % (nstep, ndstep, files, nrest))
+        outdata = outdata[:nstep * ndata]
+    return outdata, nstep
+
+
 class GtcConverter(Converter):
     '''
     Parameters in gtc.out
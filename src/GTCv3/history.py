@@ -59,7 +59,7 @@ import numpy as np
 from .. import tools
 from ..cores.converter import Converter, clog
 from ..cores.digger import Digger, dlog
-from .gtc import Ndigits_tstep
+from .gtc import Ndigits_tstep, trim_time_steps
 
 _all_Converters = ['HistoryConverter']
 _all_Diggers = ['HistoryParticleDigger',
@@ -100,25 +100,23 @@ class HistoryConverter(Converter):
         '''Read 'history.out'.'''
         with self.rawloader.get(self.files) as f:
             clog.debug("Read file '%s'." % self.files)
-            outdata = f.readlines()
+            header = [f.readline() for i in range(7)]
+            outdata = tools.read_floats(f)
 
         sd = {}
         # 1. diagnosis.F90:opendiag():734-735
         clog.debug("Filling datakeys: %s ..." % str(self._datakeys[:7]))
         for i, key in enumerate(self._datakeys[:6]):
-            sd.update({key: int(outdata[i].strip())})
+            sd.update({key: int(header[i].strip())})
         # 1. tstep*ndiag
-        sd.update({'tstep*ndiag': float(outdata[6].strip())})
+        sd.update({'tstep*ndiag': float(header[6].strip())})
 
         # 2. diagnosis.F90:opendiag():729::
-        outdata = np.array([float(n.strip()) for n in outdata[7:]])
         ndata = sd['nspecies'] * sd['mpdiag'] + \
             sd['nfield'] * (2 * sd['modes'] + sd['mfdiag'])
-        if len(outdata) // ndata != sd['ndstep']:
-            ndstep = len(outdata) // ndata
-            clog.debug("Updating datakey: %s=%d ..." % ('ndstep', ndstep))
-            sd.update({'ndstep': len(outdata) // ndata})
-            outdata = outdata[:sd['ndstep'] * ndata]
+        outdata, ndstep = trim_time_steps(
+            outdata, ndata, sd['ndstep'], self.files)
+        sd.update({'ndstep': ndstep})
 
         # reshape outdata
         outdata = outdata.reshape((ndata, sd['ndstep']), order='F')
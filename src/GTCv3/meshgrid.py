@@ -22,7 +22,7 @@ diagnosis.F90, subroutine diagnosis:37-50
     endif
 '''
 
-import numpy
+from .. import tools
 from ..cores.converter import Converter, clog
 from ..cores.digger import Digger, dlog
 
@@ -50,7 +50,7 @@ class MeshgridConverter(Converter):
         '''Read 'meshgrid.out'.'''
         with self.rawloader.get(self.files) as f:
             clog.debug("Read file '%s'." % self.files)
-            outdata = f.readlines()
+            outdata = tools.read_floats(f)
 
         sd = {}
         shape = (7, len(outdata) // 7)
@@ -60,7 +60,6 @@ class MeshgridConverter(Converter):
                          % (self.files, shape))
 
         clog.debug("Filling datakeys: %s ..." % str(self._datakeys[:]))
-        outdata = numpy.array([float(n.strip()) for n in outdata])
         outdata = outdata.reshape(shape, order='F')
         for i, key in enumerate(self._datakeys):
             sd.update({key: outdata[i]})
@@ -11,7 +11,7 @@ from ..cores.converter import Converter, clog
 from ..cores.digger import Digger, dlog
 from .. import tools
 from .data1d import _Data1dDigger
-from .gtc import Ndigits_tstep
+from .gtc import Ndigits_tstep, trim_time_steps
 
 _all_Converters = ['Data1dDensityConverter']
 _all_Diggers = ['Data1dDensityDigger', 'HistoryRZFDigger']
@@ -39,19 +39,18 @@ class Data1dDensityConverter(Converter):
         '''Read 'data1d_density.out'.'''
         with self.rawloader.get(self.files) as f:
             clog.debug("Read file '%s'." % self.files)
-            outdata = f.readlines()
+            header = [f.readline() for i in range(4)]
+            outdata = tools.read_floats(f)
 
         sd, outsd = {}, {}
         clog.debug("Filling datakeys: %s ..." % str(self._datakeys[:4]))
         for i, key in enumerate(self._datakeys[:4]):
-            sd.update({key: int(outdata[i].strip())})
+            sd.update({key: int(header[i].strip())})
 
-        outdata = np.array([float(n.strip()) for n in outdata[4:]])
         ndata = sd['mpsi+1'] * sd['nspecies']
-        if len(outdata) // ndata != sd['ndstep']:
-            clog.debug("Filling datakeys: %s ..." % 'ndstep')
-            sd.update({'ndstep': len(outdata) // ndata})
-            outdata = outdata[:sd['ndstep'] * ndata]
+        outdata, ndstep = trim_time_steps(
+            outdata, ndata, sd['ndstep'], self.files)
+        sd.update({'ndstep': ndstep})
         # reshape outdata
         outdata = outdata.reshape((ndata, sd['ndstep']), order='F')
         # fill data
@@ -32,6 +32,7 @@ setup.F90, subroutine fieldinitial
 '''
 
 import numpy as np
+from .. import tools
 from ..cores.converter import Converter, clog
 from ..cores.digger import Digger, dlog
 from .equilibrium import _1d_data_misc
@@ -61,11 +62,10 @@ class SimugridConverter(Converter):
         '''Read 'simugrid.out'.'''
         with self.rawloader.get(self.files) as f:
             clog.debug("Read file '%s'." % self.files)
-            outdata = f.readlines()
+            N, mpsi1 = int(f.readline()), int(f.readline())
+            outdata = tools.read_floats(f)
         sd = {}
-        N, mpsi1 = int(outdata[0]), int(outdata[1])
         assert N == 17
-        outdata = outdata[2:]
         shape = (N, len(outdata) // N)
         if len(outdata) % N != 0:
             clog.warning("Missing some raw data in '%s'! Guess the shape '%s'."
@@ -74,7 +74,6 @@ class SimugridConverter(Converter):
         else:
             assert shape == (N, mpsi1)
         clog.debug("Filling datakeys: %s ..." % str(self._datakeys[:]))
-        outdata = np.array([float(n.strip()) for n in outdata])
         outdata = outdata.reshape(shape, order='F')
         for i, key in enumerate(self._datakeys):
             sd.update({key: outdata[i]})
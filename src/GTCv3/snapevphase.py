@@ -20,6 +20,7 @@ snapshot.F90::
 '''
 
 import numpy as np
+from .. import tools
 from ..cores.converter import Converter, clog
 from ..cores.digger import Digger, dlog
 from .gtc import Ndigits_tstep
@@ -54,19 +55,19 @@ class SnapEVphaseConverter(Converter):
     def _convert(self):
         with self.rawloader.get(self.files) as f:
             clog.debug("Read file '%s'." % self.files)
-            outdata = f.readlines()
+            header = [f.readline() for i in range(9)]
+            outdata = tools.read_floats(f)
 
         sd = {}
         # 1. parameters
         clog.debug("Filling datakeys: %s ..." % str(self._datakeys[:4]))
         for i, key in enumerate(self._datakeys[:4]):
-            sd.update({key: int(outdata[i].strip())})
+            sd.update({key: int(header[i].strip())})
         clog.debug("Filling datakeys: %s ..." % str(self._datakeys[4:9]))
         for i, key in enumerate(self._datakeys[4:9]):
-            sd.update({key: float(outdata[i+4].strip())})
+            sd.update({key: float(header[i+4].strip())})
         # 2. data
         shape = (sd['negrid'], sd['nvgrid'], 6, sd['nspecies'])
-        outdata = np.array([float(n.strip()) for n in outdata[9:]])
         outdata = outdata.reshape(shape, order='F')
         clog.debug("Filling datakey: %s ..." % 'ion-evphase')
         sd['ion-evphase'] = outdata[:, :, :, 0]
@@ -74,12 +74,12 @@ class SnapPhiZetaPsiConverter(Converter):
             shape = (mzeach, mpsi1, nj)
             j_list = [int(fid.readline()) for j in range(nj)]
             # data
-            outdata = np.array([float(n.strip()) for n in fid.readlines()])
+            outdata = tools.read_floats(fid)
             phi.extend(outdata.reshape(shape, order='F'))
         # tor0001.out ...
         for f in self.files[1:]:
             with self.rawloader.get(f) as fid:
-                outdata = np.array([float(n.strip()) for n in fid.readlines()])
+                outdata = tools.read_floats(fid)
                 phi.extend(outdata.reshape(shape, order='F'))
         phi = np.array(phi)
         mtoroidal = len(self.files)
@@ -444,8 +444,6 @@ class SnapPhiTimeSpectrumDigger(SnapPhiSpectrumDigger):
             mkey='nmode', pkey='rmode', mtext='Toroidal', ptext='radial')
         nmode, rmode = acckwargs['nmode'], acckwargs['rmode']
         X1, X2 = np.arange(1, nmode + 1), np.arange(1, rmode + 1)
-        # rm first item in data
-        all_data = self.pckloader.get_many(*self.srckeys[1:self.msnap])
         tstep = self.pckloader.get('gtc/tstep')
         tstep = round(tstep, Ndigits_tstep)
         time = [self.srckeys[idx].split('/')[0] for idx in range(self.msnap)]
@@ -472,26 +470,18 @@ class SnapPhiTimeSpectrumDigger(SnapPhiSpectrumDigger):
                 time = time[i0:i1]
             else:
                 dlog.warning('Cannot cutoff: %s <= time <= %s!' % (t0, t1))
-        YT1, YT2, nY, rpY = [], [], [], []
         dlog.info('%d snapshot phi data to do ...' % (i1 - i0))
-        _idxlog = (i1 - i0) // 10
-        for idx in range(i0, i1):
-            if idx % _idxlog == 0 or idx == i1 - 1:
-                dlog.info('Calculating [%d/%d] %s' % (
-                    idx+1-i0, i1 - i0, self.srckeys[idx]))
-            data = all_data[idx]
-            if data.shape != (mtgrid, mpsi1):
-                dlog.error("Invalid phi data shape!")
-                return {}, {}
-            Y1, Y2, idx1, idx2 = self._get_spectrum(
-                nmode, rmode, data, mtgrid, mpsi1,
-                acckwargs['smooth'], acckwargs['norm'])
-            YT1.append(Y1)
-            YT2.append(Y2)
-            nY.append(X1[idx1])
-            rpY.append(X2[idx2])
-        YT1, YT2 = np.array(YT1).T, np.array(YT2).T
-        nY, rpY = np.array(nY), np.array(rpY)
+        # rm first item in data
+        res = self._get_time_spectrum(
+            self.srckeys[1+i0:1+i1], (mtgrid, mpsi1),
+            nmode, rmode, mtgrid, mpsi1,
+            acckwargs['smooth'], acckwargs['norm'])
+        if res is None:
+            dlog.error("Invalid phi data shape!")
+            return {}, {}
+        YT1, YT2, idx1, idx2 = res
+        YT1, YT2 = YT1.T, YT2.T
+        nY, rpY = X1[idx1], X2[idx2]
         return dict(
             nX=X1, nY=nY, toroidal_spectrum=YT1, nmode=nmode,
             rX=X2, rpY=rpY, radial_spectrum=YT2, rmode=rmode,
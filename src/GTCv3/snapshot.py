@@ -32,12 +32,21 @@ field quantities: phi, a_para, fluidne. Last two coloumn of poloidal for coordin
 field quantities: phi, a_para, fluidne.
 '''
 
+import functools
 import numpy as np
 from .. import tools
 from ..cores.converter import Converter, clog
 from ..cores.digger import Digger, dlog
 from .gtc import Ndigits_tstep
 
+try:
+    # multi-threaded pocketfft
+    from scipy.fft import rfft as _rfft
+    _rfft = functools.partial(_rfft, workers=-1)
+except ImportError:
+    # scipy < 1.4
+    from numpy.fft import rfft as _rfft
+
 _all_Converters = ['SnapshotConverter']
 _all_Diggers = [
     'SnapshotProfileDigger', 'SnapshotPdfDigger',
@@ -67,9 +76,16 @@ class SnapshotConverter(Converter):
        poloidata 2d array is poloidata[theta,r].
     4) phi, a_para, fluidne on flux surface
        fluxdata 2d array is fluxdata[theta,zeta].
+
+    Set class attribute *field_dtype*, like numpy.float32, to store
+    the field data of poloidata and fluxdata in that dtype, default None,
+    means float64. *coord_dtype* does the same for the coordinates
+    poloidata-x, z. The profile and pdf are not cast.
     '''
     __slots__ = []
     nitems = '?'
+    field_dtype = None
+    coord_dtype = None
     itemspattern = ['^(?P<section>snap\d{5,7})\.out$',
                     '.*/(?P<section>snap\d{5,7})\.out$']
     _datakeys = (
@@ -90,80 +106,113 @@ class SnapshotConverter(Converter):
         '''Read 'snap%05d.out' % istep.'''
         with self.rawloader.get(self.files) as f:
             clog.debug("Read file '%s'." % self.files)
-            outdata = f.readlines()
+            header = [f.readline() for _ in range(7)]
 
-        sd = {}
-        # 1. parameters
-        clog.debug("Filling datakeys: %s ..." % str(self._datakeys[:7]))
-        for i, key in enumerate(self._datakeys[:6]):
-            sd.update({key: int(outdata[i].strip())})
-        # 1. T_up, 1.0/emax_inv
-        sd.update({'T_up': float(outdata[6].strip())})
+            # 1. parameters
+            clog.debug("Filling datakeys: %s ..." % str(self._datakeys[:7]))
+            sd = {key: int(line) for key, line in
+                  zip(self._datakeys[:6], header)}
+            # 1. T_up, 1.0/emax_inv
+            sd['T_up'] = float(header[6])
 
-        outdata = np.array([float(n.strip()) for n in outdata[7:]])
+            # size of profile, pdf, poloidata, fluxdata
+            count = (sd['mpsi+1'] * 6 * sd['nspecies']
+                     + sd['nvgrid'] * 4 * sd['nspecies']
+                     + sd['mtgrid+1'] * sd['mpsi+1'] * (sd['nfield'] + 2)
+                     + sd['mtgrid+1'] * sd['mtoroidal'] * sd['nfield'])
+            outdata = tools.read_floats(f, count=count)
+
+        # all blocks are views of outdata, cursor is the start of next one
+        cursor = 0
 
         # 2. profile(0:mpsi,6,nspecies)
         tempsize = sd['mpsi+1'] * 6 * sd['nspecies']
-        tempshape = (sd['mpsi+1'], 6, sd['nspecies'])
-        tempdata = outdata[:tempsize].reshape(tempshape, order='F')
-        clog.debug("Filling datakey: %s ..." % 'ion-profile')
-        sd.update({'ion-profile': tempdata[:, :, 0]})
-        if sd['nspecies'] > 1:
-            clog.debug("Filling datakey: %s ..." % 'electron-profile')
-            sd.update({'electron-profile': tempdata[:, :, 1]})
-        if sd['nspecies'] > 2:
-            clog.debug("Filling datakey: %s ..." % 'fastion-profile')
-            sd.update({'fastion-profile': tempdata[:, :, 2]})
+        # species is the slowest axis, so tempdata[k] is contiguous
+        tempshape = (sd['nspecies'], 6, sd['mpsi+1'])
+        tempdata = outdata[cursor:cursor + tempsize].reshape(tempshape)
+        cursor += tempsize
+        for k, key in enumerate(self._datakeys[7:7 + sd['nspecies']]):
+            clog.debug("Filling datakey: %s ..." % key)
+            sd.update({key: tempdata[k].T})
 
         # 3. pdf(nvgrid,4,nspecies)
-        index0 = tempsize
         tempsize = sd['nvgrid'] * 4 * sd['nspecies']
-        index1 = index0 + tempsize
-        tempshape = (sd['nvgrid'], 4, sd['nspecies'])
-        tempdata = outdata[index0:index1].reshape(tempshape, order='F')
-        clog.debug("Filling datakey: %s ..." % 'ion-pdf')
-        sd.update({'ion-pdf': tempdata[:, :, 0]})
-        if sd['nspecies'] > 1:
-            clog.debug("Filling datakey: %s ..." % 'electron-pdf')
-            sd.update({'electron-pdf': tempdata[:, :, 1]})
-        if sd['nspecies'] > 2:
-            clog.debug("Filling datakey: %s ..." % 'fastion-pdf')
-            sd.update({'fastion-pdf': tempdata[:, :, 2]})
+        tempshape = (sd['nspecies'], 4, sd['nvgrid'])
+        tempdata = outdata[cursor:cursor + tempsize].reshape(tempshape)
+        cursor += tempsize
+        for k, key in enumerate(self._datakeys[10:10 + sd['nspecies']]):
+            clog.debug("Filling datakey: %s ..." % key)
+            sd.update({key: tempdata[k].T})
 
         # 4. poloidata(0:mtgrid,0:mpsi,nfield+2), nfield=3 or 5
         clog.debug("Filling datakeys: %s ..." % str(self._datakeys[13:18]))
         tempsize = sd['mtgrid+1'] * sd['mpsi+1'] * (sd['nfield'] + 2)
-        index0, index1 = index1, index1 + tempsize
-        tempshape = (sd['mtgrid+1'], sd['mpsi+1'], sd['nfield'] + 2)
-        tempdata = outdata[index0:index1].reshape(tempshape, order='F')
-        sd.update({'poloidata-phi': tempdata[:, :, 0]})
-        sd.update({'poloidata-apara': tempdata[:, :, 1]})
-        sd.update({'poloidata-fluidne': tempdata[:, :, 2]})
-        sd.update({'poloidata-x': tempdata[:, :, -2]})
-        sd.update({'poloidata-z': tempdata[:, :, -1]})
+        tempshape = (sd['nfield'] + 2, sd['mpsi+1'], sd['mtgrid+1'])
+        tempdata = outdata[cursor:cursor + tempsize].reshape(tempshape)
+        cursor += tempsize
+        coords = tempdata[-2:]
+        if self.coord_dtype is not None:
+            coords = coords.astype(self.coord_dtype)
+        sd.update({'poloidata-x': coords[0].T})
+        sd.update({'poloidata-z': coords[1].T})
+        tempdata = self._field_astype(tempdata[:sd['nfield']])
+        sd.update({'poloidata-phi': tempdata[0].T})
+        sd.update({'poloidata-apara': tempdata[1].T})
+        sd.update({'poloidata-fluidne': tempdata[2].T})
         if sd['nfield'] == 5:
             clog.debug("Filling datakeys: %s ..." % str(
                 ('poloidata-densityi', 'poloidata-densitye')))
-            sd.update({'poloidata-densityi': tempdata[:, :, 3]})
-            sd.update({'poloidata-densitye': tempdata[:, :, 4]})
+            sd.update({'poloidata-densityi': tempdata[3].T})
+            sd.update({'poloidata-densitye': tempdata[4].T})
 
         # 5. fluxdata(0:mtgrid,mtoroidal,nfield)
         clog.debug("Filling datakeys: %s ..." % str(self._datakeys[18:]))
         tempsize = sd['mtgrid+1'] * sd['mtoroidal'] * sd['nfield']
-        index0, index1 = index1, index1 + tempsize
-        tempshape = (sd['mtgrid+1'], sd['mtoroidal'], sd['nfield'])
-        tempdata = outdata[index0:index1].reshape(tempshape, order='F')
-        sd.update({'fluxdata-phi': tempdata[:, :, 0]})
-        sd.update({'fluxdata-apara': tempdata[:, :, 1]})
-        sd.update({'fluxdata-fluidne': tempdata[:, :, 2]})
+        tempshape = (sd['nfield'], sd['mtoroidal'], sd['mtgrid+1'])
+        tempdata = outdata[cursor:cursor + tempsize].reshape(tempshape)
+        cursor += tempsize
+        tempdata = self._field_astype(tempdata)
+        sd.update({'fluxdata-phi': tempdata[0].T})
+        sd.update({'fluxdata-apara': tempdata[1].T})
+        sd.update({'fluxdata-fluidne': tempdata[2].T})
         if sd['nfield'] == 5:
             clog.debug("Filling datakeys: %s ..." % str(
                 ('fluxdata-densityi', 'fluxdata-densitye')))
-            sd.update({'fluxdata-densityi': tempdata[:, :, 3]})
-            sd.update({'fluxdata-densitye': tempdata[:, :, 4]})
+            sd.update({'fluxdata-densityi': tempdata[3].T})
+            sd.update({'fluxdata-densitye': tempdata[4].T})
 
         return sd
 
+    def _field_astype(self, data):
+        '''Return field *data* in :attr:`field_dtype` if it is set.'''
+        if self.field_dtype is None:
+            return data
+        return data.astype(self.field_dtype)
+
+
+@functools.lru_cache(maxsize=32)
+def _cached_arange(start, stop, div=None):
+    '''
+    Return cached ``np.arange(start, stop)``, or ``arange / div * 2 * pi``
+    if *div* is given. The array is read-only, as it is shared by calls.
+    '''
+    arr = np.arange(start, stop)
+    if div is not None:
+        arr = arr / div * 2 * np.pi
+    arr.flags.writeable = False
+    return arr
+
+
+@functools.lru_cache(maxsize=8)
+def _cached_midpoints(lo, hi, n):
+    '''
+    Return cached, read-only midpoints of *n* equal bins in [lo, hi].
+    '''
+    d = (hi - lo) / n
+    arr = np.linspace(lo+d/2.0, hi-d/2.0, n)
+    arr.flags.writeable = False
+    return arr
+
 
 def _snap_get_timestr(snapgroup, pckloader):
     istep = int(snapgroup.replace('snap', ''))
@@ -189,9 +238,12 @@ class SnapshotProfileDigger(Digger):
         title = '%s %s, %s' % (self.section[1], 'profile',
                                _snap_get_timestr(self.group, self.pckloader))
         data, x1 = self.pckloader.get_many(*self.srckeys)
-        data = data.T
+        # converter stores data in Fortran order, then data.T is already
+        # C-contiguous and no copy is made, but loaders which give C-order
+        # arrays (hdf5) need one copy, so that each data[i] is contiguous
+        data = np.ascontiguousarray(data.T)
         return dict(
-            ipsi=np.arange(x1),
+            ipsi=_cached_arange(0, x1),
             density=data[0],
             densitydf=data[1],
             flow=data[2],
@@ -234,11 +286,10 @@ class SnapshotPdfDigger(Digger):
         title = '%s %s, %s' % (self.section[1], 'distribution function',
                                _snap_get_timestr(self.group, self.pckloader))
         data, nvgrid, T_up = self.pckloader.get_many(*self.srckeys)
-        dE = T_up / nvgrid
-        xE = np.linspace(0.0+dE/2.0, T_up-dE/2.0, nvgrid)
-        dpitch = 2.0 / nvgrid
-        xpitch = np.linspace(-1.0+dpitch/2.0, 1.0-dpitch/2.0, nvgrid)
-        data = data.T
+        xE = _cached_midpoints(0.0, T_up, nvgrid)
+        xpitch = _cached_midpoints(-1.0, 1.0, nvgrid)
+        # no copy for Fortran-order data from converter, as profile
+        data = np.ascontiguousarray(data.T)
         return dict(
             xE=xE, T_up=T_up, efullf=data[0], edf=data[1],
             xpitch=xpitch, pafullf=data[2], padf=data[3],
@@ -291,8 +342,8 @@ class SnapshotFieldFluxDigger(Digger):
         data = self.pckloader.get(self.srckeys[0])
         y, x = data.shape  # 0-mtgrid; 1-mtoroidal
         return dict(
-            zeta=np.arange(1, x+1) / x * 2 * np.pi,  # (0,2pi]
-            theta=np.arange(0, y) / (y-1) * 2 * np.pi,  # [0,2pi]
+            zeta=_cached_arange(1, x+1, x),  # (0,2pi]
+            theta=_cached_arange(0, y, y-1),  # [0,2pi]
             field=data,
             title=r'$%s$ on flux surface, %s' % (fstr, title)), {}
 
@@ -334,16 +385,24 @@ class SnapshotFieldFluxTileDigger(SnapshotFieldFluxDigger):
                        value=3,
                        description='zeta N_2pi:'))
         acckwargs = dict(N=N)
-        c1, c2 = field, field
+        # tile row indexes of field, c1 is a list of column blocks
+        c2 = np.arange(field.shape[0])
+        c1 = [c2]
         zeta1, theta1 = zeta, theta
         for i in range(1, N):
-            h1 = c1[sep*(i-1):sep*i]
+            h1 = slice(sep*(i-1), sep*i)
             t2 = c2[-sep:] if i == 1 else c2[-sep*i:-sep*(i-1)]
-            c1, c2 = np.row_stack((c1, h1)), np.row_stack((t2, c2))
-            c1 = np.column_stack((c1, c2))
+            c1, c2 = [np.append(c, c[h1]) for c in c1], np.append(t2, c2)
+            c1.append(c2)
             zeta1 = np.append(zeta1, zeta+2*np.pi*i)
             theta1 = np.append(theta1, theta1[sep*(i-1):sep*i]+2*np.pi)
-        return dict(title=title, field=c1, zeta=zeta1, theta=theta1), acckwargs
+        # gather each block once
+        x = field.shape[1]
+        tiled = np.empty((c2.size, N*x), dtype=field.dtype)
+        for i, c in enumerate(c1):
+            tiled[:, i*x:(i+1)*x] = field[c]
+        return dict(title=title, field=tiled,
+                    zeta=zeta1, theta=theta1), acckwargs
 
     def _post_dig(self, results):
         r = results
@@ -401,9 +460,10 @@ class SnapshotFieldFluxCorrLenDigger(SnapshotFieldFluxTileDigger):
         mtau, Cx = [], []
         for n, X, Y in [(0, dzeta, tau.max(axis=0)), (1, dzeta, tau[0, :]),
                         (2, dtheta, tau.max(axis=1)), (3, dtheta, tau[:, 0])]:
-            index = np.where(Y <= 1.0/np.e)[0]
-            if index.size > 0:
-                i, j = index[0] - 1,  index[0]
+            # first crossing, stop at 1st True, no index array
+            j = np.argmax(Y <= 1.0/np.e)
+            if Y[j] <= 1.0/np.e:
+                i = j - 1
                 Xm, y = tools.intersection_4points(
                     X[i], Y[i], X[j], Y[j],
                     X[i], 1.0/np.e, X[j], 1.0/np.e)
@@ -523,6 +583,24 @@ class SnapshotFieldPoloidalDigger(Digger):
         return dict(zip_results=zip_results)
 
 
+def _fft_power_sum(YY, nmode, N, L):
+    '''
+    Sum |Y[..., j, :]|^2 + |Y[..., N-j, :]|^2 along the last axis
+    for j in [0, nmode), where Y is the FFT of real data along axis -2
+    with length *L*, and *YY* is its rfft half. For real data,
+    |Y[k]| == |Y[L-k]|. Leading axes, if any, are batched.
+    Only the needed modes are touched, and einsum reduces them
+    without building the whole power array.
+    '''
+    def abs2sum(Z):
+        return (np.einsum('...ij,...ij->...i', Z.real, Z.real)
+                + np.einsum('...ij,...ij->...i', Z.imag, Z.imag))
+    neg = N - np.arange(1, nmode)
+    Y = abs2sum(YY[..., :nmode, :])
+    Y[..., 1:] += abs2sum(YY[..., np.minimum(neg, L - neg), :])
+    return Y
+
+
 class SnapshotFieldSpectrumDigger(Digger):
     '''field or density poloidal and parallel spectra.'''
     __slots__ = []
@@ -541,27 +619,47 @@ class SnapshotFieldSpectrumDigger(Digger):
 
     def _get_spectrum(self, mmode, pmode, fluxdata, mtgrid, mtoroidal,
                       smooth, norm):
-        Y1, Y2 = np.zeros(mmode), np.zeros(pmode)
-        for i in range(mtoroidal):
-            yy = np.fft.fft(fluxdata[:, i])
-            Y1[0] = Y1[0] + (abs(yy[0]))**2
-            for j in range(1, mmode):
-                Y1[j] = Y1[j] + (abs(yy[j]))**2 + (abs(yy[mtgrid - j]))**2
+        '''
+        *fluxdata* may be a stack of snapshots, shape (..., rows, mtoroidal),
+        then Y1, Y2, idx1, idx2 have the same leading axes.
+        '''
+        # poloidal, fft of all columns fluxdata[..., :, i] at once
+        YY = _rfft(fluxdata, axis=-2)
+        Y1 = _fft_power_sum(YY, mmode, mtgrid, fluxdata.shape[-2])
         Y1 = np.sqrt(Y1 / mtoroidal) / mtgrid
-        for i in range(mtgrid):
-            yy = np.fft.fft(fluxdata[i, :])
-            Y2[0] = Y2[0] + (abs(yy[0]))**2
-            for j in range(1, pmode):
-                Y2[j] = Y2[j] + (abs(yy[j]))**2 + (abs(yy[mtoroidal - j]))**2
+        # parallel, fft of rows fluxdata[..., i, :], i < mtgrid
+        YY = _rfft(fluxdata[..., :mtgrid, :], axis=-1)
+        Y2 = _fft_power_sum(np.swapaxes(YY, -1, -2),
+                            pmode, mtoroidal, mtoroidal)
         Y2 = np.sqrt(Y2 / mtgrid) / mtoroidal
         if smooth:
             Y1 = tools.savgolay_filter(Y1, info='spectrum')
             Y2 = tools.savgolay_filter(Y2, info='spectrum')
         if norm:
-            Y1, Y2 = Y1/Y1.max(), Y2/Y2.max()
-        idx1, idx2 = np.argmax(Y1), np.argmax(Y2)
+            Y1 = Y1/Y1.max(axis=-1, keepdims=True)
+            Y2 = Y2/Y2.max(axis=-1, keepdims=True)
+        idx1, idx2 = np.argmax(Y1, axis=-1), np.argmax(Y2, axis=-1)
         return Y1, Y2, idx1, idx2
 
+    def _get_time_spectrum(self, keys, shape, mmode, pmode, mtgrid,
+                           mtoroidal, smooth, norm, chunksize=32):
+        '''
+        Fetch data of *keys* *chunksize* snapshots at a time, and get
+        their spectra by batched FFTs. Return None for invalid shape.
+        '''
+        res = [], [], [], []
+        for k in range(0, len(keys), chunksize):
+            chunk = self.pckloader.get_many(*keys[k:k+chunksize])
+            if any(d.shape != shape for d in chunk):
+                return None
+            dlog.info('Calculating [%d/%d] %s' % (
+                k + len(chunk), len(keys), keys[k]))
+            for lst, r in zip(res, self._get_spectrum(
+                    mmode, pmode, np.stack(chunk), mtgrid, mtoroidal,
+                    smooth, norm)):
+                lst.append(r)
+        return tuple(np.concatenate(lst) for lst in res)
+
     def _set_params(self, kwargs, mtgrid, mtoroidal,
                     mkey='mmode', pkey='pmode',
                     mtext='Poloidal', ptext='parallel'):
@@ -614,7 +712,8 @@ class SnapshotFieldSpectrumDigger(Digger):
         mtgrid = mtgrid1 - 1
         acckwargs = self._set_params(kwargs, mtgrid, mtoroidal)
         mmode, pmode = acckwargs['mmode'], acckwargs['pmode']
-        X1, X2 = np.arange(1, mmode + 1), np.arange(1, pmode + 1)
+        X1 = _cached_arange(1, mmode + 1)
+        X2 = _cached_arange(1, pmode + 1)
         smooth, norm = acckwargs['smooth'], acckwargs['norm']
         Y1, Y2, idx1, idx2 = self._get_spectrum(
             mmode, pmode, fluxdata, mtgrid, mtoroidal, smooth, norm)
@@ -668,9 +767,8 @@ class SnapshotTimeFieldSpectrumDigger(SnapshotFieldSpectrumDigger):
         mtgrid = mtgrid1 - 1
         acckwargs = self._set_params(kwargs, mtgrid, mtoroidal)
         mmode, pmode = acckwargs['mmode'], acckwargs['pmode']
-        X1, X2 = np.arange(1, mmode + 1), np.arange(1, pmode + 1)
-        # rm first item in fluxdata
-        all_fluxdata = self.pckloader.get_many(*self.srckeys[1:index])
+        X1 = _cached_arange(1, mmode + 1)
+        X2 = _cached_arange(1, pmode + 1)
         tstep = self.pckloader.get('gtc/tstep')
         tstep = round(tstep, Ndigits_tstep)
         time = [self.srckeys[idx].split('/')[0] for idx in range(index)]
@@ -697,26 +795,18 @@ class SnapshotTimeFieldSpectrumDigger(SnapshotFieldSpectrumDigger):
                 time = time[i0:i1]
             else:
                 dlog.warning('Cannot cutoff: %s <= time <= %s!' % (t0, t1))
-        YT1, YT2, mY, pY = [], [], [], []
         dlog.info('%d snapshot fluxdata to do ...' % (i1 - i0))
-        _idxlog = max(1, (i1 - i0) // 10)
-        for idx in range(i0, i1):
-            if idx % _idxlog == 0 or idx == i1 - 1:
-                dlog.info('Calculating [%d/%d] %s' % (
-                    idx+1-i0, i1 - i0, self.srckeys[idx]))
-            fluxdata = all_fluxdata[idx]
-            if fluxdata.shape != (mtgrid1, mtoroidal):
-                dlog.error("Invalid fluxdata shape!")
-                return {}, {}
-            Y1, Y2, idx1, idx2 = self._get_spectrum(
-                mmode, pmode, fluxdata, mtgrid, mtoroidal,
-                acckwargs['smooth'], acckwargs['norm'])
-            YT1.append(Y1)
-            YT2.append(Y2)
-            mY.append(X1[idx1])
-            pY.append(X2[idx2])
-        YT1, YT2 = np.array(YT1).T, np.array(YT2).T
-        mY, pY = np.array(mY), np.array(pY)
+        # rm first item in fluxdata
+        res = self._get_time_spectrum(
+            self.srckeys[1+i0:1+i1], (mtgrid1, mtoroidal),
+            mmode, pmode, mtgrid, mtoroidal,
+            acckwargs['smooth'], acckwargs['norm'])
+        if res is None:
+            dlog.error("Invalid fluxdata shape!")
+            return {}, {}
+        YT1, YT2, idx1, idx2 = res
+        YT1, YT2 = YT1.T, YT2.T
+        mY, pY = X1[idx1], X2[idx2]
         fstr = field_tex_str[self.section[1]]
         return dict(
             mX=X1, mY=mY, poloidal_spectrum=YT1, mmode=mmode,
@@ -790,12 +880,13 @@ class SnapshotFieldProfileDigger(Digger):
                     rangee=(0, mpsi1 - 1, 1),
                     value=ipsi,
                     description='ipsi:'))
-        X1, Y11 = np.arange(0, mpsi1), pdata[jtgrid, :]
-        X2 = np.arange(0, mtgrid1) / mtgrid1 * 2 * np.pi
+        X1, Y11 = _cached_arange(0, mpsi1), pdata[jtgrid, :]
+        X2 = _cached_arange(0, mtgrid1, mtgrid1)
         Y21 = pdata[:, ipsi]
-        # f*f [ f[i,j]*f[i,j] ]; np.sum, axis=0, along col
-        Y12 = np.sqrt(np.sum(pdata * pdata, axis=0) / mtgrid1)
-        Y22 = np.sqrt(np.sum(pdata * pdata, axis=1) / mpsi1)
+        # f*f [ f[i,j]*f[i,j] ]; sum, axis=0, along col
+        # einsum fuses multiply and sum, no pdata*pdata temporary
+        Y12 = np.sqrt(np.einsum('ij,ij->j', pdata, pdata) / mtgrid1)
+        Y22 = np.sqrt(np.einsum('ij,ij->i', pdata, pdata) / mpsi1)
         fstr = field_tex_str[self.section[1]]
         timestr = _snap_get_timestr(self.group, self.pckloader)
         return dict(
@@ -826,9 +917,56 @@ class SnapshotFieldProfileDigger(Digger):
         ], suptitle=r['suptitle'])
 
 
+def _fieldm(pdata, mtgrid1, mpsi1):
+    '''
+    Return read-only abs(field_m(r)) of poloidata *pdata*,
+    shape (mtgrid1//2, mpsi1-2).
+    '''
+    # fft of all columns pdata[:, ipsi], 0 < ipsi < mpsi1-1, at once
+    # real pdata, rfft keeps only modes 0..mtgrid1//2
+    dy_ft = _rfft(pdata[:, 1:mpsi1-1], axis=0)[:mtgrid1//2]
+    fieldm = np.abs(dy_ft/mtgrid1 * 2)  # why /mtgrid1 * 2
+    fieldm.flags.writeable = False
+    return fieldm
+
+
+def _near_peak_width(F, X, lowerlimit):
+    '''
+    Vectorized `tools.near_peak` (select='1', intersection=True)
+    for every row F[j], return 1D array of their widths newX[-1]-newX[0].
+    '''
+    nj, n = F.shape
+    rows = np.arange(nj)
+    idx = np.arange(n)
+    peak = F.argmax(axis=1)
+    limit = lowerlimit * F[rows, peak]
+    below = ~(F >= limit[:, np.newaxis])
+    # all F[j, left:right+1] >= limit, unless F[j, peak] < limit
+    mask = below & (idx <= peak[:, np.newaxis])
+    left = np.where(mask.any(axis=1), n - np.argmax(mask[:, ::-1], axis=1), 0)
+    left = np.minimum(left, peak)
+    mask = below & (idx >= peak[:, np.newaxis])
+    right = np.where(mask.any(axis=1), np.argmax(mask, axis=1) - 1, n - 1)
+    right = np.maximum(right, peak)
+    edges = []
+    for edge, i1, i2, inner in ((left, left - 1, left, left > 0),
+                                (right, right, right + 1, right < n - 1)):
+        x = X[edge].astype(float)
+        has = inner & (F[rows, edge] > limit)
+        c, i1, i2 = rows[has], i1[has], i2[has]
+        # tools.intersection_4points of line P1P2 and P3P4, y=limit
+        P1x, P1y, P2x, P2y = X[i1], F[c, i1], X[i2], F[c, i2]
+        P3x, P3y, P4x, P4y = P1x, limit[c], P2x, limit[c]
+        tmp = (P1x-P2x)*(P3y-P4y)-(P1y-P2y)*(P3x-P4x)
+        x[has] = ((P1x*P2y-P1y*P2x)*(P3x-P4x)
+                  - (P3x*P4y-P3y*P4x)*(P1x-P2x))/tmp
+        edges.append(x)
+    return edges[1] - edges[0]
+
+
 class SnapshotFieldmDigger(Digger):
     '''profile of field_m or density_m'''
-    __slots__ = []
+    __slots__ = ['_fieldm_memo']
     nitems = '+'
     itemspattern = [
         '^(?P<section>snap\d{5,7})'
@@ -851,12 +989,7 @@ class SnapshotFieldmDigger(Digger):
             dlog.error("Invalid poloidata shape!")
             return {}, {}
         rr = arr2[:, 1] / a
-        fieldm = []
-        for ipsi in range(1, mpsi1 - 1):
-            y = pdata[:, ipsi]
-            dy_ft = np.fft.fft(y)/mtgrid1 * 2  # why /mtgrid1 * 2
-            fieldm.append(abs(dy_ft[:mtgrid1//2]))
-        fieldm = np.array(fieldm).T
+        fieldm = self._get_fieldm(pdata, mtgrid1, mpsi1)
         jlist, acckwargs, rr_s, Y_s, dr, dr_fwhm, envY, envXp, envYp, envXmax, envYmax = \
             self._remove_add_some_lines(fieldm, rr, kwargs)
         return dict(rr=rr, fieldm=fieldm, jlist=jlist,
@@ -866,6 +999,18 @@ class SnapshotFieldmDigger(Digger):
                     title=r'$\left|{%s}_m(r)\right|$, %s' % (fstr, timestr)
                     ), acckwargs
 
+    def _get_fieldm(self, pdata, mtgrid1, mpsi1):
+        '''
+        The widgets only change the selection of lines, so keep the last
+        fieldm until pckloader gives another *pdata* object, like after
+        :meth:`update` or cache eviction of pckloader.
+        '''
+        memo = getattr(self, '_fieldm_memo', None)
+        if memo is None or memo[0] is not pdata:
+            memo = (pdata, _fieldm(pdata, mtgrid1, mpsi1))
+            self._fieldm_memo = memo
+        return memo[1]
+
     def _remove_add_some_lines(self, fieldm, rr, kwargs):
         '''
         kwargs
@@ -906,13 +1051,17 @@ class SnapshotFieldmDigger(Digger):
         ymaxselect = kwargs.get('ymaxselect', 0)
         cal_dr = False
         if isinstance(ymaxlimit, float) and 0 < ymaxlimit < 1:
-            maxlimit = fieldm.max() * ymaxlimit
-            jpass = fieldm.max(axis=1) >= maxlimit
+            ymax = fieldm.max(axis=1)  # ymax of lines
+            maxlimit = ymax.max() * ymaxlimit
+            jpass = ymax >= maxlimit
             jlist = [i for i, j in enumerate(jpass) if j]
         elif isinstance(ymaxselect, int) and ymaxselect > 0:
             indices1 = fieldm.argmax(axis=1)
             data = fieldm[np.arange(fieldm.shape[0]), indices1]
-            indices0 = data.argsort()[-ymaxselect:]  # index of select lines
+            # index of select lines, top ymaxselect in ascending order
+            k = min(ymaxselect, data.size)
+            indices0 = np.argpartition(data, -k)[-k:]
+            indices0 = indices0[data[indices0].argsort()]
             rr_s = rr[indices1[indices0]]
             # sort by rr
             jlist = list(indices0[rr_s.argsort()])  # 0 -> ymaxselect-1
@@ -924,13 +1073,8 @@ class SnapshotFieldmDigger(Digger):
             Y_s = data[jlist]
             dr = np.average(np.diff(rr_s))
             # dr by fwhm
-            _drs = []
-            for j in jlist:
-                _X, _Y = tools.near_peak(
-                    fieldm[j], X=rr, intersection=True,
-                    lowerlimit=1.0/2.0, select='1')
-                _drs.append(_X[-1]-_X[0])
-            dr_fwhm = np.average(_drs)
+            dr_fwhm = np.average(
+                _near_peak_width(fieldm[jlist], rr, 1.0/2.0))
         else:
             rr_s, Y_s, dr, dr_fwhm = 'n', 'n', 'n', 'n'
         envelope = kwargs.get('envelope', False)
@@ -939,19 +1083,14 @@ class SnapshotFieldmDigger(Digger):
             maxfm = fieldm.max(axis=0)
             tmp = np.gradient(maxfm, rr)
             zerolimit = tmp.max()*1e-6
-            add_indexs = []
-            # increase
-            for i in range(len(tmp)//2):
-                if tmp[i] >= - zerolimit:
-                    add_indexs.append(i)
-                else:
-                    break
-            # decrease
-            for i in range(len(tmp)-1, len(tmp)//2, -1):
-                if tmp[i] <= zerolimit:
-                    add_indexs.append(i)
-                else:
-                    break
+            n, half = len(tmp), len(tmp)//2
+            # increase, from 0 until the first tmp[i] < -zerolimit
+            stop = np.flatnonzero(~(tmp[:half] >= - zerolimit))
+            add_indexs = list(range(stop[0] if stop.size else half))
+            # decrease, from n-1 down until the first tmp[i] > zerolimit
+            stop = np.flatnonzero(~(tmp[:half:-1] <= zerolimit))
+            add_indexs.extend(
+                range(n-1, n-1-(stop[0] if stop.size else n-1-half), -1))
             Y = tools.high_envelope(
                 maxfm, X=rr, kind=kind, add_indexs=add_indexs)
             newX, newY = tools.near_peak(
@@ -1024,12 +1163,33 @@ class SnapshotFieldmkthetaDigger(BreakDigDoc, SnapshotFieldmDigger):
         m_max = kwargs.get('m_max', None)
         if not (isinstance(m_max, int) and m_max <= maxmmode):
             m_max = maxmmode
-        m = np.arange(1, m_max + 1)
+        m = np.arange(1, m_max + 1, dtype=float)
         fieldm = fieldm[:m_max, :]
         order = kwargs.get('mean_weight_order', 2)
         rho0, a = self.pckloader.get_many('gtc/rho0', 'gtc/a_minor')
-        m2_r = np.array([np.average(m**order, weights=fieldm[:, i]**order)
-                         for i in range(rr.size)])
+        # average(m**order, weights=fieldm[:, i]**order) for all i
+        if order in (2, 4, 6, 8):
+            # widget orders, multiply in place instead of calling pow
+            weights = fieldm * fieldm
+            if order == 6:
+                weights *= weights * weights
+            elif order >= 4:
+                weights *= weights
+                if order == 8:
+                    weights *= weights
+        else:
+            weights = fieldm**order
+        wsum = weights.sum(axis=0)
+        nonzero = wsum > 0
+        if nonzero.all():
+            m2_r = np.dot(m**order, weights) / wsum
+        else:
+            # no mean m where all weights are zero, set nan on purpose
+            dlog.warning("All weights are zero at %d radial points, "
+                         "set their mean m to nan." % (~nonzero).sum())
+            m2_r = np.full(wsum.shape, np.nan)
+            m2_r[nonzero] = (np.dot(m**order, weights[:, nonzero])
+                             / wsum[nonzero])
         mean_m = np.power(m2_r, 1.0/order)
         ktrho0 = mean_m/(rr*a)*rho0
         dlog.parm("at r=0.5a, mean m=%.1f." % mean_m[rr.size//2])
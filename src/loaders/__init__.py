@@ -97,7 +97,8 @@ def is_rawloader(obj):
     return isinstance(obj, base.BaseRawLoader)
 
 
-def get_pckloader(path, datagroups_exclude=None):
+def get_pckloader(path, datagroups_exclude=None, cache_maxbytes=None,
+                  cache_maxitems=None):
     '''
     Given a file path or dict cache, return a pickled loader instance.
     Raises IOError if path not found, ValueError if path type not supported.
@@ -134,7 +135,8 @@ def get_pckloader(path, datagroups_exclude=None):
             raise IOError("Can't find path '%s'!" % path)
     else:
         raise ValueError("Var *path* should be str or dict object!")
-    return Loader(path, datagroups_exclude=datagroups_exclude)
+    return Loader(path, datagroups_exclude=datagroups_exclude,
+                  cache_maxbytes=cache_maxbytes, cache_maxitems=cache_maxitems)
 
 
 def is_pckloader(obj):
@@ -8,13 +8,30 @@ Contains loader base class.
 
 import os
 import re
+import bisect
 import contextlib
+import operator
+import functools
+import itertools
+import collections
 
 from ..glogger import getGLogger
 from ..utils import simple_parse_doc
 
 __all__ = ['BaseLoader', 'BaseRawLoader', 'BasePckLoader']
 log = getGLogger('L')
+_re_special = re.compile(r'[\\.^$*+?{}\[\]|()]').search
+_re_compile = functools.lru_cache(maxsize=256)(re.compile)
+
+
+def _literal_prefix(pattern):
+    '''
+    Return the literal prefix that regular expression *pattern* matches,
+    if its only special characters are escaped dots, else return None.
+    '''
+    if _re_special(pattern.replace('\\.', '')):
+        return None
+    return pattern.replace('\\.', '.')
 
 
 class BaseLoader(object):
@@ -25,7 +42,7 @@ class BaseLoader(object):
     ----------
     path: str
     '''
-    __slots__ = ['path', 'pathobj']
+    __slots__ = ['path', 'pathobj', '_keyset', '_findcache']
     loader_type = 'base'
 
     def __init__(self, path):
@@ -77,6 +94,34 @@ class BaseLoader(object):
         '''
         raise NotImplementedError()
 
+    def _special_get_many(self, pathobj, keys):
+        '''
+        Return a list of value objects of *keys* in path object.
+        Override it to read many keys at once or in a better order.
+        '''
+        return [self._special_get(pathobj, key) for key in keys]
+
+    @staticmethod
+    def _exclude_keys(keys, patterns):
+        '''
+        Return a list of *keys* which match none of the regular
+        expressions *patterns*, in one pass over *keys*.
+        Patterns whose only special characters are escaped dots, like
+        r'bigdata\.out', are literal prefixes, tested by str.startswith
+        instead of the regex engine. An unescaped dot matches any
+        character, so 'bigdata.out' still goes through the regex engine.
+        '''
+        prefixes = [_literal_prefix(p) for p in patterns]
+        literals = tuple(lit for lit in prefixes if lit is not None)
+        if literals:
+            keys = itertools.filterfalse(
+                operator.methodcaller('startswith', literals), keys)
+        # chained lazy filters, predicates all run in C
+        for p, lit in zip(patterns, prefixes):
+            if lit is None:
+                keys = itertools.filterfalse(_re_compile(p).match, keys)
+        return list(keys)
+
     def _special_get(self, pathobj, item):
         '''
         Return value object of key *item* in path object.
@@ -97,35 +142,46 @@ class BaseLoader(object):
         '''
         Find the loader keys which contain *items*.
         '''
-        result = self.keys()
-        for i in items:
-            i = str(i)
-            result = tuple(
-                filter(lambda k: True if i in k else False, result))
-        return tuple(result)
+        items = tuple(str(i) for i in items)
+        return self._memo_find(
+            ('find', items),
+            lambda: tuple(k for k in self.keys()
+                          if all(i in k for i in items)))
 
     def refind(self, pattern):
         '''
         Find the loader keys which match the regular expression *pattern*.
         '''
-        pat = re.compile(pattern)
-        return tuple(filter(
-            lambda k: True if pat.match(k) else False, self.keys()))
+        return self._memo_find(
+            ('refind', pattern),
+            lambda: tuple(filter(_re_compile(pattern).match, self.keys())))
+
+    def _memo_find(self, memokey, func):
+        '''
+        Return cached result of :meth:`find` or :meth:`refind`.
+        The cache is reset by :meth:`update`.
+        '''
+        result = self._findcache.get(memokey)
+        if result is None:
+            result = func()
+            if len(self._findcache) >= 1024:
+                self._findcache.clear()
+            self._findcache[memokey] = result
+        return result
 
     def __contains__(self, item):
         '''
         Return true if item is in loader, false otherwise.
         '''
-        return item in self.keys()
+        return item in self._keyset
 
     def all_in_loader(self, *items):
         '''
         Check if all the *items* are in this loader.
         '''
-        loaderkeys = self.keys()
         result = True
         for i in items:
-            if i not in loaderkeys:
+            if i not in self._keyset:
                 log.warning("Key '%s' not in %s!" % (i, self.path))
                 result = False
         return result
@@ -136,13 +192,21 @@ class BaseLoader(object):
         # return '<{0}.{1} object at {2} for {3}>'.format(
         #    self.__module__, type(self).__name__, hex(id(self)), self.path)
 
+    @classmethod
+    def _pickle_slots(cls):
+        '''Slot names to pickle, computed once per class.'''
+        names = cls.__dict__.get('_pickle_slotnames')
+        if names is None:
+            names = tuple(name for c in cls.__mro__
+                          for name in getattr(c, '__slots__', [])
+                          if name != 'pathobj')
+            cls._pickle_slotnames = names
+        return names
+
     def __getstate__(self):
         # self.pathobj may has '_io.BufferedReader' object,
         # which cannot be pickled, when use multiprocessing.
-        return [(name, getattr(self, name))
-                for cls in type(self).__mro__
-                for name in getattr(cls, '__slots__', [])
-                if name != 'pathobj']
+        return [(name, getattr(self, name)) for name in self._pickle_slots()]
 
     def __setstate__(self, state):
         for name, value in state:
@@ -178,7 +242,7 @@ class BaseRawLoader(BaseLoader):
         path of directory or file
     filenames_exclude: list
         a list of filenames or regular expressions to exclude filenames,
-        example: [r'.*\.txt$', 'bigdata.out'] or [r'(?!^include\.out$)']
+        example: [r'.*\.txt$', r'bigdata\.out'] or [r'(?!^include\.out$)']
 
     Notes
     -----
@@ -199,16 +263,16 @@ class BaseRawLoader(BaseLoader):
     def update(self):
         self.close()
         self.filenames = None
+        self._keyset, self._findcache = frozenset(), {}
         try:
             log.debug("Open path %s." % self.path)
             pathobj = self._special_open()
             log.debug("Getting filenames from %s ..." % self.path)
-            filenames = self._special_getkeys(pathobj)
-            for pat in self.filenames_exclude:
-                pat = re.compile(pat)
-                filenames = [k for k in filenames if not pat.match(k)]
+            filenames = self._exclude_keys(
+                self._special_getkeys(pathobj), self.filenames_exclude)
             self.pathobj = pathobj
             self.filenames = tuple(sorted(filenames))
+            self._keyset = frozenset(self.filenames)
         except (IOError, ValueError):
             log.error("Failed to read path %s." % self.path, exc_info=1)
             raise
@@ -222,7 +286,7 @@ class BaseRawLoader(BaseLoader):
         Get file-like object by filename *key*.
         A function for with statement context managers.
         '''
-        if key not in self.filenames:
+        if key not in self._keyset:
             raise KeyError("%s is not in '%s'" % (key, self.path))
         try:
             log.debug("Getting file '%s' from %s ..." % (key, self.path))
@@ -267,8 +331,12 @@ class BasePckLoader(BaseLoader):
     description: str or None
         description of the data, if 'description' is in datakeys
     desc: alias description
-    cache: dict
-        cached datakeys from file
+    cache: OrderedDict
+        cached datakeys from file, least recently used first
+    cache_maxbytes: int or None
+        size limit of arrays in :attr:`cache`
+    cache_maxitems: int or None
+        count limit of values in :attr:`cache`
 
     Parameters
     ----------
@@ -277,27 +345,39 @@ class BasePckLoader(BaseLoader):
     datagroups_exclude: list
         a list of datagroups or regular expressions to exclude datagroups,
         example: [r'sanp\d+$', 'bigdata']
+    cache_maxbytes: int
+        if set, drop least recently used values from :attr:`cache` when
+        their total nbytes exceeds it, default None, no limit
+    cache_maxitems: int
+        if set, drop least recently used values from :attr:`cache` when
+        their count exceeds it, default None, no limit
     '''
     __slots__ = ['datakeys', 'datagroups', 'datagroups_exclude',
-                 'desc', 'description', 'cache']
+                 'desc', 'description', 'cache', '_sortedkeys',
+                 'cache_maxbytes', 'cache_maxitems', '_cachebytes']
 
     def _special_getgroups(self, pathobj):
         '''
         Return all keys' groups in path object.
         '''
-        return set(os.path.dirname(k) for k in self.datakeys)
+        return set(k.rpartition('/')[0] for k in self.datakeys)
 
-    def __init__(self, path, datagroups_exclude=None):
+    def __init__(self, path, datagroups_exclude=None, cache_maxbytes=None,
+                 cache_maxitems=None):
         super(BasePckLoader, self).__init__(path)
         if isinstance(datagroups_exclude, (tuple, list)):
             self.datagroups_exclude = datagroups_exclude
         else:
             self.datagroups_exclude = []
+        self.cache_maxbytes = cache_maxbytes
+        self.cache_maxitems = cache_maxitems
         self.update()
 
     def update(self):
         self.close()
         self.datakeys, self.datagroups = None, None
+        self._keyset, self._sortedkeys = frozenset(), []
+        self._findcache = {}
         self.description, self.desc = None, None
         try:
             log.debug("Open path %s." % self.path)
@@ -309,26 +389,31 @@ class BasePckLoader(BaseLoader):
             all_datagroups = set(self._special_getgroups(pathobj))
             if '' in all_datagroups:
                 all_datagroups.remove('')
-            datagroups = list(all_datagroups)
-            for pat in self.datagroups_exclude:
-                pat = re.compile(pat)
-                datagroups = [k for k in datagroups if not pat.match(k)]
+            datagroups = self._exclude_keys(
+                all_datagroups, self.datagroups_exclude)
             self.datagroups = tuple(sorted(datagroups))
             exc_datagroups = all_datagroups - set(datagroups)
             if exc_datagroups:
-                for grp in exc_datagroups:
-                    self.datakeys = tuple(
-                        k for k in self.datakeys if not k.startswith(grp))
+                # one pass, str.startswith checks all groups' prefixes
+                exc_prefixes = tuple('%s/' % grp for grp in exc_datagroups)
+                self.datakeys = tuple(k for k in self.datakeys
+                                      if not k.startswith(exc_prefixes))
+            self._keyset = frozenset(self.datakeys)
+            self._sortedkeys = sorted(self.datakeys)
             log.debug("Getting description of %s ..." % self.path)
-            if 'description' in self.datakeys:
-                self.desc = str(self._special_get(pathobj, 'description'))
+            if 'description' in self._keyset:
+                rawdesc = self._special_get(pathobj, 'description')
+                self.desc = str(rawdesc)
             else:
                 self.desc = None
             self.description = self.desc
         except (IOError, ValueError):
             log.error("Failed to read path %s." % self.path, exc_info=1)
             raise
-        self.cache = {}
+        self.clear_cache()
+        if self.desc is not None:
+            # seed cache, get('description') needs not read it again
+            self._cache_add('description', rawdesc)
 
     def keys(self):
         return self.datakeys
@@ -340,14 +425,15 @@ class BasePckLoader(BaseLoader):
         '''
         Get value by ``key`.
         '''
-        if key not in self.datakeys:
+        if key not in self._keyset:
             raise KeyError("%s is not in '%s'" % (key, self.path))
         if key in self.cache:
+            self.cache.move_to_end(key)
             return self.cache[key]
         try:
             log.debug("Getting key '%s' from %s ..." % (key, self.path))
             value = self._special_get(self.pathobj, key)
-            self.cache[key] = value
+            self._cache_add(key, value)
         except (IOError, ValueError):
             log.error("Failed to get '%s' from %s!" %
                       (key, self.path), exc_info=1)
@@ -360,24 +446,40 @@ class BasePckLoader(BaseLoader):
         '''
         Get values by ``keys``. Return a tuple of values.
         '''
-        result = [self.cache[k] if k in self.cache else None for k in keys]
-        idxtodo = [i for i, k in enumerate(result) if k is None]
+        cache = self.cache
+        result, idxtodo = [None] * len(keys), []
+        for i, k in enumerate(keys):
+            try:
+                cache.move_to_end(k)  # KeyError if not cached
+            except KeyError:
+                idxtodo.append(i)
+            else:
+                result[i] = cache[k]
         if len(idxtodo) == 0:
             return tuple(result)
+        todo = [keys[i] for i in idxtodo]
         try:
-            for i in idxtodo:
-                key = keys[i]
-                log.debug("Getting key '%s' from %s ..." % (key, self.path))
-                value = self._special_get(self.pathobj, key)
-                result[i] = value
-                self.cache[key] = value
+            log.debug("Getting keys %s from %s ..." % (todo, self.path))
+            values = self._special_get_many(self.pathobj, todo)
         except (IOError, ValueError):
-            if 'key' in dir():
-                log.error("Failed to get '%s' from %s!" %
-                          (key, self.path), exc_info=1)
-            else:
-                log.error("Failed to open '%s'!" % self.path, exc_info=1)
+            log.error("Failed to get %s from %s!" %
+                      (todo, self.path), exc_info=1)
             raise
+        for i, key, value in zip(idxtodo, todo, values):
+            result[i] = value
+            self._cache_add(key, value)
+        return tuple(result)
+
+    def _keys_with_prefix(self, prefix):
+        '''
+        Return datakeys which start with *prefix*, bisect in sorted keys.
+        '''
+        keys = self._sortedkeys
+        result = []
+        for i in range(bisect.bisect_left(keys, prefix), len(keys)):
+            if not keys[i].startswith(prefix):
+                break
+            result.append(keys[i])
         return tuple(result)
 
     def get_by_group(self, group):
@@ -385,11 +487,32 @@ class BasePckLoader(BaseLoader):
         Get all values by ``keys`` in group.
         Return a dict of keys' basenames and values.
         '''
-        allkeys = self.refind('^%s/' % re.escape(group))
-        basekeys = [os.path.basename(k) for k in allkeys]
+        allkeys = self._keys_with_prefix('%s/' % group)
+        basekeys = [k.rpartition('/')[2] for k in allkeys]
         resultstuple = self.get_many(*allkeys)
         results = {k: v for k, v in zip(basekeys, resultstuple)}
         return results
 
+    def _cache_add(self, key, value):
+        '''
+        Add *value* to :attr:`cache`, then drop the least recently used
+        values, except *key*, while the cache exceeds :attr:`cache_maxbytes`
+        or :attr:`cache_maxitems`.
+        '''
+        if key in self.cache:
+            self._cachebytes -= getattr(self.cache[key], 'nbytes', 0)
+        self.cache[key] = value
+        self._cachebytes += getattr(value, 'nbytes', 0)
+        maxbytes, maxitems = self.cache_maxbytes, self.cache_maxitems
+        if maxbytes is None and maxitems is None:
+            return
+        while len(self.cache) > 1 and (
+                (maxbytes is not None and self._cachebytes > maxbytes)
+                or (maxitems is not None and len(self.cache) > maxitems)):
+            oldkey, oldvalue = self.cache.popitem(last=False)
+            self._cachebytes -= getattr(oldvalue, 'nbytes', 0)
+            log.debug("Drop cached key '%s' of %s." % (oldkey, self.path))
+
     def clear_cache(self):
-        self.cache = {}
+        self.cache = collections.OrderedDict()
+        self._cachebytes = 0
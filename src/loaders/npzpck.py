@@ -60,3 +60,15 @@ class NpzPckLoader(BasePckLoader):
         if value.size == 1:
             value = value.item()
         return value
+
+    def _special_get_many(self, pathobj, keys):
+        # read members in their order in the archive, sequential on disk
+        def offset(i):
+            try:
+                return pathobj.zip.getinfo(keys[i] + '.npy').header_offset
+            except (AttributeError, KeyError):
+                return 0
+        values = [None] * len(keys)
+        for i in sorted(range(len(keys)), key=offset):
+            values[i] = self._special_get(pathobj, keys[i])
+        return values
@@ -93,3 +93,8 @@ class PckLoaderTest(object):
             numpy.array_equal(loader.get('test/array'), DATA['test/array']))
         self.assertEqual(loader.get('test/float'), 3.1415)
         self.assertEqual(loader.get('te/st/int'), 1)
+        loader.clear_cache()
+        vector, bver, flt = loader.get_many(
+            'test/vector', 'bver', 'test/float')
+        self.assertTrue(numpy.array_equal(vector, DATA['test/vector']))
+        self.assertEqual((bver, flt), (DATA['bver'], 3.1415))
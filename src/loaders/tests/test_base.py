@@ -6,8 +6,9 @@ import os
 import unittest
 import tempfile
 import contextlib
+import numpy
 
-from ..base import BaseRawLoader, BasePckLoader
+from ..base import BaseRawLoader, BasePckLoader, _literal_prefix
 
 
 class ImpBaseRawLoader(BaseRawLoader):
@@ -71,6 +72,27 @@ class TestBaseRawLoader(unittest.TestCase):
         loader.update()
         self.assertListEqual(loader._special_history,
                              ['check', 'open', 'close', 'open'])
+        loader = ImpBaseRawLoader(
+            self.tmpfile, filenames_exclude=[r'^f1$', r'd3/.*'])
+        self.assertTupleEqual(loader.filenames, ('d2/f2',))
+        # literal pattern, same as re.match, excludes names with the prefix
+        loader = ImpBaseRawLoader(self.tmpfile, filenames_exclude=['d'])
+        self.assertTupleEqual(loader.filenames, ('f1',))
+
+    def test_rawloader_literal_prefix(self):
+        # escaped dots take the str.startswith path
+        self.assertEqual(_literal_prefix(r'bigdata\.out'), 'bigdata.out')
+        self.assertEqual(_literal_prefix('d2/f'), 'd2/f')
+        # unescaped dot matches any character, so regex path
+        self.assertIsNone(_literal_prefix('bigdata.out'))
+        self.assertIsNone(_literal_prefix(r'd\\.x'))
+        keys = ['bigdata.out', 'bigdata_out', 'small.out']
+        self.assertListEqual(
+            BaseRawLoader._exclude_keys(keys, [r'bigdata\.out']),
+            ['bigdata_out', 'small.out'])
+        self.assertListEqual(
+            BaseRawLoader._exclude_keys(keys, ['bigdata.out']),
+            ['small.out'])
 
     def test_rawloader_get(self):
         loader = ImpBaseRawLoader(self.tmpfile)
@@ -93,6 +115,11 @@ class TestBaseRawLoader(unittest.TestCase):
         self.assertTrue('f1' in loader)
         self.assertTrue(loader.all_in_loader('f1', 'd2/f2'))
         self.assertFalse(loader.all_in_loader('f1', 'd2/f2', 'f3'))
+        loader = ImpBaseRawLoader(self.tmpfile, filenames_exclude=['^d2/'])
+        self.assertFalse('d2/f2' in loader)
+        with self.assertRaises(KeyError):
+            with loader.get('d2/f2'):
+                pass
 
 
 class ImpBasePckLoader(BasePckLoader):
@@ -143,13 +170,21 @@ class TestBasePckLoader(unittest.TestCase):
         self.assertSetEqual(
             set(loader.datagroups), set(ImpBasePckLoader._G))
         self.assertMultiLineEqual(loader.description, 'desc')
-        self.assertEqual(len(loader.cache), 0)
+        self.assertEqual(list(loader.cache), ['description'])
         loader = ImpBasePckLoader(
             self.tmpfile,
             datagroups_exclude=[r'^g2$'])
         self.assertSetEqual(
             set(loader.datagroups), {'g3', 'g4/sg4'})
 
+        class ImpLoader(ImpBasePckLoader):
+            _D = dict(ImpBasePckLoader._D, **{'g33/k5': 5})
+        loader = ImpLoader(self.tmpfile, datagroups_exclude=[r'^g3$'])
+        self.assertSetEqual(
+            set(loader.datagroups), {'g2', 'g33', 'g4/sg4'})
+        self.assertTrue('g33/k5' in loader)
+        self.assertFalse('g3/k33' in loader)
+
     def test_pckloader_get(self):
         loader = ImpBasePckLoader(self.tmpfile)
         self.assertEqual(loader.get('k1'), 1)
@@ -163,16 +198,54 @@ class TestBasePckLoader(unittest.TestCase):
         self.assertEqual(loader.get_many('k1', 'g2/k2'), (1, 2))
         self.assertTrue('k1' in loader.cache)
 
+    def test_pckloader_cache_maxbytes(self):
+        class ImpLoader(ImpBasePckLoader):
+            _D = {'g/a': numpy.zeros(10), 'g/b': numpy.zeros(10),
+                  'g/c': numpy.zeros(10)}
+        loader = ImpLoader(self.tmpfile)
+        loader.get_many('g/a', 'g/b', 'g/c')
+        self.assertEqual(list(loader.cache), ['g/a', 'g/b', 'g/c'])
+        loader = ImpLoader(self.tmpfile, cache_maxbytes=160)
+        loader.get_many('g/a', 'g/b')
+        loader.get('g/a')
+        loader.get('g/c')
+        self.assertEqual(list(loader.cache), ['g/a', 'g/c'])
+        loader.clear_cache()
+        self.assertEqual(len(loader.cache), 0)
+
+    def test_pckloader_cache_maxitems(self):
+        loader = ImpBasePckLoader(self.tmpfile, cache_maxitems=2)
+        self.assertEqual(list(loader.cache), ['description'])
+        loader.get_many('k1', 'g2/k2')
+        loader.get('k1')
+        loader.get('g3/k3')
+        self.assertEqual(list(loader.cache), ['k1', 'g3/k3'])
+        loader = ImpBasePckLoader(self.tmpfile, cache_maxitems=0)
+        self.assertEqual(loader.get('k1'), 1)
+        self.assertEqual(list(loader.cache), ['k1'])
+
     def test_pckloader_get_by_group(self):
         loader = ImpBasePckLoader(self.tmpfile)
         self.assertEqual(loader.get_by_group('g3'), {'k3': 3, 'k33': 33})
+        self.assertEqual(loader.get_by_group('g4'), {'k4': 4})
+        self.assertEqual(loader.get_by_group('g'), {})
 
     def test_pckloader_find(self):
         loader = ImpBasePckLoader(self.tmpfile)
         self.assertEqual(loader.find('g', 33), ('g3/k33',))
         self.assertEqual(loader.refind('^g.*4$'), ('g4/sg4/k4',))
+        result = loader.find('g', 33)
+        self.assertIs(loader.find('g', '33'), result)
+        loader.update()
+        self.assertEqual(len(loader._findcache), 0)
+        self.assertEqual(loader.find('g', 33), result)
 
     def test_pckloader_contains(self):
         loader = ImpBasePckLoader(self.tmpfile)
         self.assertTrue(loader.all_in_loader('k1', 'g2/k2', 'g4/sg4/k4'))
         self.assertFalse(loader.all_in_loader('k1', 'g2/k2', 'lost-key'))
+        loader = ImpBasePckLoader(self.tmpfile, datagroups_exclude=[r'^g3$'])
+        self.assertFalse('g3/k3' in loader)
+        self.assertTrue('g2/k2' in loader)
+        with self.assertRaises(KeyError):
+            loader.get('g3/k33')
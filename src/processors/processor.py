@@ -737,7 +737,8 @@ class Processor(object):
 
     def __init__(self, path, add_desc=None, filenames_exclude=None,
                  savetype='.npz', overwrite=False, Sid=False,
-                 datagroups_exclude=None, add_visplter='mpl::'):
+                 datagroups_exclude=None, add_visplter='mpl::',
+                 cache_maxbytes=2 * 1024**3, cache_maxitems=512):
         '''
         Pick up raw data or converted data in *path*,
         set processor's rawloader, pcksaver and pckloader, etc.
@@ -764,6 +765,9 @@ class Processor(object):
             regular expressions to exclude datagroups in pckloader
         add_visplter: str
             add visplter by type *add_visplter*, default 'mpl::'
+        cache_maxbytes, cache_maxitems: int or None
+            limits of the data cache in pckloader, total nbytes and
+            count of values, default 2GiB and 512, None means no limit
         '''
         root, ext1 = os.path.splitext(path)
         root, ext2 = os.path.splitext(root)
@@ -793,7 +797,9 @@ class Processor(object):
                 return
             try:
                 self.pckloader = get_pckloader(
-                    path, datagroups_exclude=datagroups_exclude)
+                    path, datagroups_exclude=datagroups_exclude,
+                    cache_maxbytes=cache_maxbytes,
+                    cache_maxitems=cache_maxitems)
             except Exception:
                 plog.error("%s: Invalid pckloader path '%s'!"
                            % (self.name, path), exc_info=1)
@@ -839,7 +845,10 @@ class Processor(object):
                 return
             try:
                 self.pckloader = get_pckloader(
-                    self.pcksaver.get_store(), datagroups_exclude=datagroups_exclude)
+                    self.pcksaver.get_store(),
+                    datagroups_exclude=datagroups_exclude,
+                    cache_maxbytes=cache_maxbytes,
+                    cache_maxitems=cache_maxitems)
             except Exception:
                 plog.error("%s: Invalid pckloader path '%s'!"
                            % (self.name, path), exc_info=1)
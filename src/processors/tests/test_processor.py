@@ -48,6 +48,11 @@ class TestSerialProcessor(unittest.TestCase):
         self.assertTrue(gdp.resloader is not None)
         self.assertTrue(gdp.resfileloader is not None)
         self.assertTrue(self.figlabel in gdp.availablelabels)
+        self.assertEqual(gdp.pckloader.cache_maxitems, 512)
+        gdp = get_processor(self.tmp, name='TDP', parallel='off',
+                            cache_maxbytes=None, cache_maxitems=8)
+        self.assertIsNone(gdp.pckloader.cache_maxbytes)
+        self.assertEqual(gdp.pckloader.cache_maxitems, 8)
 
     def test_processor_dig(self):
         gdp = get_processor(self.tmp, name='TDP', parallel='off')
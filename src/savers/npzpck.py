@@ -23,6 +23,8 @@ __all__ = ['NpzPckSaver']
 log = getGLogger('S')
 _np_write_array = np.lib.format.write_array
 Use_ZipFile_open_mode_w = True
+# arrays smaller than this are serialized in memory, then ZipFile.writestr
+Small_array_nbytes = 65536
 
 
 @inherit_docstring((BasePckSaver,), _copydoc_func, template=None)
@@ -37,6 +39,14 @@ class NpzPckSaver(BasePckSaver):
     {Parameters}
     duplicate_name: bool
         allow "zipfile.py: UserWarning: Duplicate name ..." or not
+    compression: int
+        ZIP compression method, like zipfile.ZIP_DEFLATED, ZIP_STORED,
+        default None, use the method in :data:`Compress_kwds`
+    compresslevel: int
+        compression level for Python >= 3.7, default None
+    store_floats: bool
+        store float and complex arrays without compression or not,
+        they are often nearly incompressible, default False
 
     Notes
     {Notes}
@@ -47,19 +57,32 @@ class NpzPckSaver(BasePckSaver):
     2. /usr/lib/python3.x/site-packages/numpy/lib/npyio.py, funtion zipfile_factory _savez
     3. https://docs.python.org/3/library/zipfile.html#zipfile.ZipFile
     '''
-    __slots__ = ['duplicate_name']
+    __slots__ = ['duplicate_name', 'compress_kwds', 'store_floats']
     _extension = '.npz'
 
-    def __init__(self, path, duplicate_name=True):
+    def __init__(self, path, duplicate_name=True,
+                 compression=None, compresslevel=None, store_floats=False):
         super(NpzPckSaver, self).__init__(path)
         self.duplicate_name = duplicate_name
-        log.debug('Using ZipFile compression parameters: %s' % Compress_kwds)
+        self.compress_kwds = Compress_kwds.copy()
+        if compression is not None:
+            self.compress_kwds['compression'] = compression
+        if compresslevel is not None and Py_version_tuple >= (3, 7, 0):
+            self.compress_kwds['compresslevel'] = compresslevel
+        self.store_floats = store_floats
+        log.debug('Using ZipFile compression parameters: %s'
+                  % self.compress_kwds)
 
     def _open_append(self):
-        return zipfile_factory(self.path, mode="a")
+        return zipfile_factory(self.path, mode="a", **self.compress_kwds)
 
     def _open_new(self):
-        return zipfile_factory(self.path, mode="w")
+        return zipfile_factory(self.path, mode="w", **self.compress_kwds)
+
+    def _compress_type(self, val):
+        if self.store_floats and val.dtype.kind in 'fc':
+            return zipfile.ZIP_STORED
+        return self.compress_kwds['compression']
 
     def __zf_open_write(self, name, val):
         """
@@ -71,11 +94,11 @@ class NpzPckSaver(BasePckSaver):
         # fix: https://github.com/python/cpython/blob/3.6/Lib/zipfile.py#L1371
         zinfo = zipfile.ZipInfo(filename=name,
                                 date_time=time.localtime(time.time())[:6])
-        zinfo.compress_type = Compress_kwds['compression']
-        if 'compresslevel' in Compress_kwds:
-            zinfo._compresslevel = Compress_kwds['compresslevel']
+        zinfo.compress_type = self._compress_type(val)
+        if 'compresslevel' in self.compress_kwds:
+            zinfo._compresslevel = self.compress_kwds['compresslevel']
         with self._storeobj.open(zinfo, 'w', force_zip64=True) as f:
-            _np_write_array(f, np.asanyarray(val), allow_pickle=True)
+            _np_write_array(f, val, allow_pickle=True)
 
     def __zf_writestr(self, name, val):
         """
@@ -84,9 +107,10 @@ class NpzPckSaver(BasePckSaver):
         """
         # log.debug("Using ZipFile.writestr(name, bytes-data) ...")
         with io.BytesIO() as f:
-            _np_write_array(f, np.asanyarray(val), allow_pickle=True)
+            _np_write_array(f, val, allow_pickle=True)
             data = f.getvalue()
-            self._storeobj.writestr(name, data)
+            self._storeobj.writestr(
+                name, data, compress_type=self._compress_type(val))
 
     def _write(self, group, data):
         if not self.duplicate_name:
@@ -106,7 +130,11 @@ class NpzPckSaver(BasePckSaver):
                 else:
                     name = group + '/' + key + '.npy'
                 log.debug("Writting %s ..." % name)
-                if Use_ZipFile_open_mode_w and Py_version_tuple >= (3, 6, 0):
+                if not isinstance(val, np.ndarray):
+                    val = np.asanyarray(val)
+                if (Use_ZipFile_open_mode_w and Py_version_tuple >= (3, 6, 0)
+                        and (val.dtype.hasobject
+                             or val.nbytes >= Small_array_nbytes)):
                     self.__zf_open_write(name, val)  # ZipFile.open
                 else:
                     self.__zf_writestr(name, val)  # ZipFile.writestr
@@ -3,6 +3,7 @@
 # Copyright (c) 2018-2020 shmilee
 
 import unittest
+import zipfile
 import numpy
 from . import PckSaverTest
 from ..npzpck import NpzPckSaver
@@ -49,5 +50,18 @@ class TestNpzPckSaver(PckSaverTest, unittest.TestCase):
         outkeys = set(npz.files)
         self.assertSetEqual(inkeys, outkeys)
 
+    def test_npzsaver_compression(self):
+        with self.PckSaver(self.tmpfile, compression=zipfile.ZIP_DEFLATED,
+                           store_floats=True) as saver:
+            saver.write('/', {'f': numpy.ones(10), 'i': numpy.arange(10)})
+        with zipfile.ZipFile(saver.get_store()) as z:
+            self.assertEqual(z.getinfo('f.npy').compress_type,
+                             zipfile.ZIP_STORED)
+            self.assertEqual(z.getinfo('i.npy').compress_type,
+                             zipfile.ZIP_DEFLATED)
+        f, i = self.saver_get(saver.get_store(), 'f', 'i')
+        self.assertTrue(numpy.array_equal(f, numpy.ones(10)))
+        self.assertTrue(numpy.array_equal(i, numpy.arange(10)))
+
     def test_npzsaver_with(self):
         self.saver_with()
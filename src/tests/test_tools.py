@@ -0,0 +1,97 @@
+# -*- coding: utf-8 -*-
+
+# Copyright (c) 2020 shmilee
+
+import io
+import unittest
+import numpy
+
+from ..tools import read_floats, correlation
+
+
+class TestReadFloats(unittest.TestCase):
+    '''
+    Test function read_floats
+    '''
+
+    def setUp(self):
+        self.data = numpy.linspace(-1.0, 1.0, 50)
+        self.text = ''.join('%.6e\n' % x for x in self.data)
+
+    def test_read_all(self):
+        for fobj in (io.StringIO(self.text),
+                     io.BytesIO(self.text.encode())):
+            self.assertTrue(numpy.allclose(read_floats(fobj), self.data))
+
+    def test_chunk_boundary(self):
+        # chunks end inside numbers and lines
+        for chunksize in (1, 5, 7, 13, 64):
+            result = read_floats(io.StringIO(self.text), chunksize=chunksize)
+            self.assertTrue(numpy.allclose(result, self.data))
+            result = read_floats(io.StringIO(self.text),
+                                 chunksize=chunksize, sizehint=20)
+            self.assertTrue(numpy.allclose(result, self.data))
+
+    def test_count(self):
+        result = read_floats(io.StringIO(self.text), count=30, chunksize=7)
+        self.assertTrue(numpy.allclose(result, self.data[:30]))
+        result = read_floats(io.StringIO(self.text), count=50)
+        self.assertTrue(numpy.allclose(result, self.data))
+        with self.assertRaises(ValueError):
+            read_floats(io.StringIO(self.text), count=51)
+
+    def test_count_trailing_text(self):
+        # text after count numbers is ignored, for any chunksize
+        for tail in ('abc\n', '0.123456-100 3.0\n', '4.0 x'):
+            for chunksize in (1, 7, 64, 4096):
+                result = read_floats(io.StringIO(self.text + tail),
+                                     count=50, chunksize=chunksize)
+                self.assertTrue(numpy.allclose(result, self.data))
+        text = '1.0 2.0 0.123456-100 3.0\n'
+        for count in (3, 4):
+            for chunksize in (3, 4096):
+                with self.assertRaises(ValueError):
+                    read_floats(io.StringIO(text), count=count,
+                                chunksize=chunksize)
+
+    def test_malformed(self):
+        for text in ('1.0\n2.0\n0.123456-100\n3.0\n', '1.0 abc\n2.0\n'):
+            for chunksize in (3, 4096):
+                with self.assertRaises(ValueError):
+                    read_floats(io.StringIO(text), chunksize=chunksize)
+
+
+class TestCorrelation(unittest.TestCase):
+    '''
+    Test function correlation
+    '''
+
+    def loop_tau(self, data, r0, r1, c0, c1, dr, dc):
+        tau = numpy.zeros((dr, dc))
+        with numpy.errstate(invalid='ignore'):
+            for i in range(dr):
+                for j in range(dc):
+                    tmpM0 = data[r0:r1-i, c0:c1-j]
+                    tmpM1 = data[r0+i:r1, c0+j:c1]
+                    tau[i, j] = numpy.sum(tmpM0*tmpM1) / numpy.sqrt(
+                        numpy.sum(tmpM0*tmpM0) * numpy.sum(tmpM1*tmpM1))
+        return tau
+
+    def test_fft_vs_loop(self):
+        data = numpy.random.RandomState(7).randn(40, 30)
+        for args in ((0, 40, 0, 30, 20, 15), (3, 37, 5, 28, 34, 23),
+                     (10, 20, 10, 20, 10, 10)):
+            tau, vdr, vdc = correlation(data, *args)
+            self.assertIsNone(vdr)
+            self.assertTrue(numpy.allclose(tau, self.loop_tau(data, *args)))
+
+    def test_zero_window(self):
+        data = numpy.random.RandomState(7).randn(20, 10)
+        data[-3:, :] = 0.0
+        data[:, -1] = 0.0
+        args = (0, 20, 0, 10, 20, 10)
+        tau, vdr, vdc = correlation(data, *args)
+        expected = self.loop_tau(data, *args)
+        self.assertTrue(numpy.isnan(expected[-3:, :]).all())
+        self.assertTrue(numpy.isnan(expected[:, -1]).all())
+        self.assertTrue(numpy.allclose(tau, expected, equal_nan=True))
@@ -6,10 +6,19 @@
 Some tools for Core.
 '''
 
+import warnings
 import numpy as np
 import scipy.optimize as sp_optimize
 import scipy.signal as sp_signal
 import scipy.interpolate as sp_interpolate
+try:
+    # multi-threaded pocketfft
+    import scipy.fft as sp_fft
+    _fft_kwargs = dict(workers=-1)
+except ImportError:
+    # scipy < 1.4
+    import numpy.fft as sp_fft
+    _fft_kwargs = {}
 
 from .glogger import getGLogger
 from .utils import inherit_docstring
@@ -21,6 +30,7 @@ __all__ = ['max_subarray',
            'fft', 'fft2', 'savgolay_filter',
            'findflat', 'findgrowth',
            'correlation',
+           'read_floats',
            ]
 log = getGLogger('C')
 
@@ -380,7 +390,7 @@ def fft(dt, signal):
         else:
             tf = np.linspace(-0.5, 0.5, size, endpoint=True)
         tf = 2 * np.pi / dt * tf
-        af = np.fft.fftshift(np.fft.fft(signal))
+        af = np.fft.fftshift(sp_fft.fft(signal, **_fft_kwargs))
         # pf = np.sqrt(np.power(af.real, 2) + np.power(af.imag, 2))
         pf = abs(af)
         return tf, af, pf
@@ -408,7 +418,7 @@ def fft2(dt, dx, signal):
             tf = np.linspace(-0.5, 0.5, tsize, endpoint=True)
         xf = 2 * np.pi / dx * xf
         tf = 2 * np.pi / dt * tf
-        af = np.fft.fftshift(np.fft.fft2(signal))
+        af = np.fft.fftshift(sp_fft.fft2(signal, **_fft_kwargs))
         pf = abs(af)
         return tf, xf, af, pf
     else:
@@ -424,7 +434,8 @@ def savgolay_filter(x, window_size=None, polyorder=None, info=None, **kwargs):
     Parameters
     ----------
     window_size: int
-        window length, a positive odd integer, default 51, len(x) or len(x)-1
+        window length, a positive odd integer, default 51, n or n-1,
+        n is the length of x along *axis* in kwargs, default -1
     polyorder: int
         less than window length, default 3 or window_size-1
     info: str
@@ -432,7 +443,7 @@ def savgolay_filter(x, window_size=None, polyorder=None, info=None, **kwargs):
     kwargs: passed to `scipy.signal.savgol_filter`
     '''
     if not window_size:
-        window_size = min(51, len(x))
+        window_size = min(51, np.shape(x)[kwargs.get('axis', -1)])
         if window_size % 2 == 0:
             window_size = window_size - 1
     if not polyorder:
@@ -494,29 +505,42 @@ def correlation(data, r0, r1, c0, c1, dr, dc,
     vdr: delta row array
     vdc: delta column array
     '''
-    tau = np.zeros((dr, dc))
-    logstep = max(1, round(dr/10))
-    for i in range(dr):
-        for j in range(dc):
-            # tmptau, tmpinten0, tmpinten1 = 0, 0, 0
-            # for m in range(c0, c1-j):
-            #    for n in range(r0, r1-i):
-            #        tmptau = tmptau + data[n,m]*data[n+i,m+j]
-            #        tmpinten0 = tmpinten0 + data[n,m]*data[n,m]
-            #        tmpinten1 = tmpinten1 + data[n+i,m+j]*data[n+i,m+j]
-            # tau[i,j] = tmptau/np.sqrt(tmpinten0*tmpinten1)
-            tmpM0, tmpM1 = data[r0:r1-i, c0:c1-j], data[r0+i:r1, c0+j:c1]
-            tmp = np.multiply(tmpM0, tmpM1)
-            tmptau = np.sum(tmp)
-            tmp = np.multiply(tmpM0, tmpM0)
-            tmpinten0 = np.sum(tmp)
-            tmp = np.multiply(tmpM1, tmpM1)
-            tmpinten1 = np.sum(tmp)
-            tau[i, j] = tmptau/np.sqrt(tmpinten0*tmpinten1)
-        if (i+1) % logstep == 0 or i == 0 or i+1 == dr:
-            log.info('correlation row %d/%d' % (i+1, dr))
-            # print('row %d: %s' % (i, tau[i, :]))
-            # print(tau[i,:])
+    # tau[i,j] = tmptau/np.sqrt(tmpinten0*tmpinten1)
+    # tmptau, tmpinten0, tmpinten1 = 0, 0, 0
+    # for m in range(c0, c1-j):
+    #    for n in range(r0, r1-i):
+    #        tmptau = tmptau + data[n,m]*data[n+i,m+j]
+    #        tmpinten0 = tmpinten0 + data[n,m]*data[n,m]
+    #        tmpinten1 = tmpinten1 + data[n+i,m+j]*data[n+i,m+j]
+    M = np.asarray(data[r0:r1, c0:c1], dtype=float)
+    R, C = M.shape
+    if 0 < dr <= R and 0 < dc <= C:
+        log.info('correlation matrix %dx%d by FFT' % (dr, dc))
+        # all lagged sums tmptau at once, zero-padded => no wrap-around
+        F = sp_fft.rfft2(M, s=(2*R, 2*C), **_fft_kwargs)
+        tmptau = sp_fft.irfft2(F.real**2 + F.imag**2, s=(2*R, 2*C),
+                               **_fft_kwargs)[:dr, :dc]
+        # sub-window intensities by summed-area tables
+        sq = M*M
+        tmpinten0 = sq.cumsum(axis=0).cumsum(axis=1)[::-1, ::-1][:dr, :dc]
+        tmpinten1 = sq[::-1, ::-1].cumsum(axis=0).cumsum(
+            axis=1)[::-1, ::-1][:dr, :dc]
+        # all-zero windows give nan, like 0/0 in the loop, while
+        # FFT tmptau there is only rounding error, not exact 0
+        inten = np.sqrt(tmpinten0*tmpinten1)
+        nonzero = inten > 0
+        tau = np.full((dr, dc), np.nan)
+        tau[nonzero] = tmptau[nonzero]/inten[nonzero]
+    else:
+        tau = np.zeros((dr, dc))
+        for i in range(dr):
+            for j in range(dc):
+                tmpM0 = data[r0:r1-i, c0:c1-j]
+                tmpM1 = data[r0+i:r1, c0+j:c1]
+                tmptau = np.sum(np.multiply(tmpM0, tmpM1))
+                tmpinten0 = np.sum(np.multiply(tmpM0, tmpM0))
+                tmpinten1 = np.sum(np.multiply(tmpM1, tmpM1))
+                tau[i, j] = tmptau/np.sqrt(tmpinten0*tmpinten1)
     if ruler_r is None:
         vdr = None
     else:
@@ -536,3 +560,84 @@ def correlation(data, r0, r1, c0, c1, dr, dc,
             else:
                 vdc[j] = ruler_c[c1] - ruler_c[c1-j]
     return tau, vdr, vdc
+
+
+def _floats_fromstring(text, size):
+    '''
+    Parse all numbers in *text*, raise ValueError for a bad number.
+    *size* is the count of numbers parsed before, for the message.
+    '''
+    with warnings.catch_warnings():
+        # fromstring stops at the first bad token with a warning
+        warnings.simplefilter('error', DeprecationWarning)
+        try:
+            return np.fromstring(text, dtype=np.float64, sep=' ')
+        except (DeprecationWarning, ValueError):
+            raise ValueError(
+                "Invalid number in text after %d numbers!" % size
+            ) from None
+
+
+def read_floats(fileobj, count=-1, chunksize=4194304, sizehint=0):
+    '''
+    Read whitespace separated numbers in file-like object *fileobj*,
+    text or binary mode, return a 1D float64 array. The text is parsed
+    chunk by chunk with `numpy.fromstring`, so the whole file is never
+    held as one string.
+    Raise ValueError if some parsed text is not a number, like
+    '0.123456-100', or if fewer than *count* numbers are read.
+
+    Parameters
+    ----------
+    count: int
+        number of items to read, default -1, means all the rest data.
+        If count >= 0, the result array is preallocated and filled,
+        Text after the *count* numbers may be consumed, but it is
+        never parsed, so it can be anything.
+    chunksize: int
+        number of characters to read per chunk, default 4M
+    sizehint: int
+        expected number of items when count < 0, default 0.
+        They are filled in one preallocated array, and only the numbers
+        beyond *sizehint* need another concatenation.
+    '''
+    if count >= 0:
+        sizehint = count
+    out = np.empty(sizehint, dtype=np.float64)
+    extra = []  # numbers beyond sizehint, when count < 0
+    size, tail, newline = 0, None, None
+    while count < 0 or size < count:
+        text = fileobj.read(chunksize)
+        if tail is None:
+            # str or bytes
+            tail, newline = text[:0], '\n' if isinstance(text, str) else b'\n'
+        if text:
+            # keep last incomplete line for next chunk
+            text, _, tail = (tail + text).rpartition(newline)
+        else:
+            text, tail = tail, tail[:0]
+        if text.strip():
+            try:
+                arr = _floats_fromstring(text, size)
+            except ValueError:
+                if count < 0:
+                    raise
+                # only the rest count numbers are parsed, text after them
+                # is ignored, wherever the chunks end
+                words = text.split(None, count - size)[:count - size]
+                arr = _floats_fromstring(newline.join(words), size)
+            n = max(min(arr.size, sizehint - size), 0)
+            out[size:size+n] = arr[:n]
+            if n < arr.size and count < 0:
+                extra.append(arr[n:])
+            size += arr.size
+        if not text and not tail:
+            break
+    if extra:
+        return np.concatenate([out] + extra)
+    if size < sizehint:
+        if count >= 0:
+            raise ValueError("Only %d of %d numbers are read!"
+                             % (size, count))
+        return out[:size]
+    return out